@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+# Weekly summaries are flat counter maps, keyed like this:
+#   "created"                  applications created that week
+#   "entered:<status>"         moves into <status>, creations included
+#   "reached:<status>"         applications entering <status> for the first time
+#   "left:<status>:<bucket>"   moves out of <status>, bucketed by time spent in it
+# Each status change adds to its week's summary in the same write as the event,
+# so every analytics query reads a handful of summaries and never the raw events.
+
+# Progression of an application; conversion is reported along this path
+FUNNEL_STAGES = ("Pending", "Followed up", "Accepted")
+# Where applications drop out of the funnel
+EXIT_STATUSES = ("Rejected", "Not Hiring")
+
+# Upper bounds, in hours, of the time-in-status histogram buckets; the last bucket is open-ended
+DURATION_BUCKETS_HOURS = (1, 6, 24, 48, 96, 168, 336, 720, 1440, 2160)
+
+def week_start(ts: datetime) -> datetime:
+    """Monday 00:00 of the (UTC) week containing ``ts``"""
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=day.weekday())
+
+def duration_bucket(hours: float) -> int:
+    for index, upper in enumerate(DURATION_BUCKETS_HOURS):
+        if hours < upper:
+            return index
+    return len(DURATION_BUCKETS_HOURS)
+
+def creation_event(document: dict, now: datetime) -> dict:
+    """The event recorded when an application is created"""
+    return {
+        "user_id": document["user_id"],
+        "application_id": document["_id"],
+        "from_status": None,
+        "to_status": document["status"],
+        "ts": now,
+        "hours_in_status": None,
+    }
+
+def status_change_event(before: dict, to_status: str, now: datetime) -> dict:
+    """The event recorded when ``before`` moves to ``to_status``"""
+    entered_at = before.get("status_changed_at") or before.get("date_of_applying") or now
+    return {
+        "user_id": before["user_id"],
+        "application_id": before["_id"],
+        "from_status": before.get("status"),
+        "to_status": to_status,
+        "ts": now,
+        "hours_in_status": max((now - entered_at).total_seconds() / 3600, 0.0),
+    }
+
+def event_counters(event: dict, first_time: bool) -> Dict[str, int]:
+    """Increments an event contributes to its week's summary"""
+    counters = {f"entered:{event['to_status']}": 1}
+    if event["from_status"] is None:
+        counters["created"] = 1
+    else:
+        bucket = duration_bucket(event["hours_in_status"])
+        counters[f"left:{event['from_status']}:{bucket}"] = 1
+    if first_time:
+        counters[f"reached:{event['to_status']}"] = 1
+    return counters
+
+def sum_counters(summaries: Iterable[dict]) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    for summary in summaries:
+        for key, count in summary.get("counts", {}).items():
+            totals[key] = totals.get(key, 0) + count
+    return totals
+
+def funnel(totals: Dict[str, int]) -> dict:
+    """How many applications reached each status, as a share of those created"""
+    created = totals.get("created", 0)
+    stages = []
+    previous = created
+    for status in FUNNEL_STAGES + EXIT_STATUSES:
+        reached = totals.get(f"reached:{status}", 0)
+        stage = {
+            "status": status,
+            "reached": reached,
+            "conversion": round(reached / created, 4) if created else None,
+        }
+        if status in FUNNEL_STAGES:
+            # Share of the previous stage that made it this far
+            stage["step_conversion"] = round(reached / previous, 4) if previous else None
+            previous = reached
+        stages.append(stage)
+    return {"created": created, "stages": stages}
+
+def _histogram_median(histogram: List[int]) -> Optional[float]:
+    """Median hours from bucket counts, interpolated linearly inside the bucket"""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = total / 2
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= target:
+            lower = DURATION_BUCKETS_HOURS[index - 1] if index else 0
+            if index == len(DURATION_BUCKETS_HOURS):
+                # Open-ended bucket: report its lower bound rather than invent an upper one
+                return float(lower)
+            upper = DURATION_BUCKETS_HOURS[index]
+            return round(lower + (upper - lower) * (target - seen) / count, 1)
+        seen += count
+    return None
+
+def time_in_status(totals: Dict[str, int]) -> List[dict]:
+    """Approximate median hours spent in each status before moving on"""
+    histograms: Dict[str, List[int]] = {}
+    for key, count in totals.items():
+        if not key.startswith("left:"):
+            continue
+        _, status, bucket = key.split(":")
+        histogram = histograms.setdefault(status, [0] * (len(DURATION_BUCKETS_HOURS) + 1))
+        histogram[int(bucket)] += count
+    return [
+        {"status": status, "samples": sum(histogram), "median_hours": _histogram_median(histogram)}
+        for status, histogram in sorted(histograms.items())
+    ]
+
+def weekly_activity(summaries: Iterable[dict]) -> List[dict]:
+    """Per-week creations and moves into each status, oldest week first"""
+    weeks = []
+    for summary in sorted(summaries, key=lambda s: s["week_start"]):
+        counts = summary.get("counts", {})
+        weeks.append({
+            "week_start": summary["week_start"],
+            "created": counts.get("created", 0),
+            "entered": {
+                key.split(":", 1)[1]: count for key, count in counts.items() if key.startswith("entered:")
+            },
+        })
+    return weeks
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, DESCENDING, DeleteOne, ReplaceOne
+from pymongo.errors import CollectionInvalid
+
+from .database import in_transaction
+from .scheduler import Lease, LeaseLost
+from .settings import get_settings
+
+ARCHIVE_COLLECTION = "applications_archive"
+# Final statuses: nothing more happens to these applications, so they can go cold
+ARCHIVE_STATUSES = ["Rejected", "Not Hiring"]
+
+async def ensure_indexes(db):
+    """Create the compressed archive collection and the indexes behind archival and listing"""
+    try:
+        # Cold data is written once and read rarely; trade a little CPU for much less disk and cache
+        await db.create_collection(
+            ARCHIVE_COLLECTION,
+            storageEngine={"wiredTiger": {"configString": "block_compressor=zstd"}},
+        )
+    except CollectionInvalid:
+        pass
+    archive = db[ARCHIVE_COLLECTION]
+    await archive.create_index([("user_id", ASCENDING), ("date_of_applying", DESCENDING)])
+    await archive.create_index("photo_public_id", sparse=True)
+    # Same index the reminder scan uses; it also serves the archival scan
+    await db.applications.create_index(
+        [("status", ASCENDING), ("date_of_applying", ASCENDING), ("_id", ASCENDING)],
+        name="status_date_of_applying",
+    )
+
+async def archive_applications(db, lease: Lease):
+    """
+    Move Rejected / Not Hiring applications older than ARCHIVE_AFTER_DAYS to the archive
+
+    Each batch is copied, then a document is deleted from ``applications``
+    only if it is still exactly the copy taken, so one edited in between (even
+    if it still qualifies) keeps its hot copy and loses the archived one.
+    Copies are upserts, so a batch interrupted half way is simply redone on
+    the next run. Where the deployment supports transactions each batch moves
+    atomically.
+    """
+    settings = get_settings()
+    cutoff = datetime.utcnow() - timedelta(days=settings.archive_after_days)
+    query = {"status": {"$in": ARCHIVE_STATUSES}, "date_of_applying": {"$lt": cutoff}, "deleted_at": None}
+    archive = db[ARCHIVE_COLLECTION]
+    while True:
+        batch = await db.applications.find(query).limit(settings.archive_batch_size).to_list(
+            length=settings.archive_batch_size
+        )
+        if not batch:
+            break
+        now = datetime.utcnow()
+        ids = [doc["_id"] for doc in batch]
+
+        async def move(session):
+            await archive.bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": now}, upsert=True) for doc in batch],
+                ordered=False,
+                session=session,
+            )
+            # $literal keeps values such as "$100 bonus" from being read as field paths
+            await db.applications.bulk_write(
+                [
+                    DeleteOne({"_id": doc["_id"], "$expr": {"$eq": ["$$ROOT", {"$literal": doc}]}})
+                    for doc in batch
+                ],
+                ordered=False,
+                session=session,
+            )
+            still_hot = await db.applications.distinct("_id", {"_id": {"$in": ids}}, session=session)
+            if still_hot:
+                await archive.delete_many({"_id": {"$in": still_hot}}, session=session)
+
+        await in_transaction(db, move)
+        if len(batch) < settings.archive_batch_size:
+            break
+        if not await lease.renew():
+            raise LeaseLost(lease.name)
@@ -1,25 +1,45 @@
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
-from dotenv import load_dotenv
-import os
+from .deadlines import remaining
+from .settings import get_settings
 
-load_dotenv()
+_configured = False
 
-# Configure Cloudinary
-# Use CLOUDINARY_URL if available, otherwise use individual credentials
-cloudinary_url = os.getenv("CLOUDINARY_URL")
-if cloudinary_url:
-    cloudinary.config(cloudinary_url=cloudinary_url, secure=True)
-else:
-    cloudinary.config(
-        cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-        api_key=os.getenv("CLOUDINARY_API_KEY"),
-        api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-        secure=True
-    )
+# Folder every upload goes into; the orphan sweeper only looks inside it
+UPLOAD_FOLDER = "job_tracker"
+# Admin API limit for delete_resources
+DELETE_BATCH_SIZE = 100
 
-def upload_image(file, folder="job_tracker"):
+def _cloudinary():
+    """
+    Import and configure the Cloudinary SDK on first use
+
+    The SDK pulls in urllib3 and friends, so it is kept off the startup path
+    until a request actually touches an image.
+    """
+    global _configured
+    import cloudinary
+    import cloudinary.uploader
+    import cloudinary.api
+
+    if not _configured:
+        settings = get_settings()
+        # Use CLOUDINARY_URL if available, otherwise use individual credentials
+        if settings.cloudinary_url:
+            cloudinary.config(cloudinary_url=settings.cloudinary_url, secure=True)
+        else:
+            cloudinary.config(
+                cloud_name=settings.cloudinary_cloud_name,
+                api_key=settings.cloudinary_api_key,
+                api_secret=settings.cloudinary_api_secret,
+                secure=True
+            )
+        _configured = True
+    return cloudinary
+
+def _timeout() -> float:
+    """HTTP timeout for one SDK call: what is left of the request's deadline, else the configured cap"""
+    return remaining(get_settings().cloudinary_timeout_seconds)
+
+def upload_image(file, folder=UPLOAD_FOLDER):
     """
     Upload an image to Cloudinary
     
@@ -31,10 +51,12 @@ def upload_image(file, folder="job_tracker"):
         dict: Cloudinary upload result with public_id and secure_url
     """
     try:
+        cloudinary = _cloudinary()
         result = cloudinary.uploader.upload(
             file,
             folder=folder,
             resource_type="image",
+            timeout=_timeout(),
             transformation=[
                 {"width": 500, "height": 500, "crop": "limit"},
                 {"quality": "auto"},
@@ -61,11 +83,55 @@ def delete_image(public_id):
         dict: Cloudinary deletion result
     """
     try:
-        result = cloudinary.uploader.destroy(public_id)
+        cloudinary = _cloudinary()
+        result = cloudinary.uploader.destroy(public_id, timeout=_timeout())
         return result
     except Exception as e:
         raise Exception(f"Failed to delete image from Cloudinary: {str(e)}")
 
+def delete_images(public_ids):
+    """
+    Delete several images from Cloudinary with the batched Admin API
+
+    Args:
+        public_ids: The public_ids of the images to delete
+
+    Returns:
+        dict: Maps each public_id to its outcome ("deleted", "not_found", ...)
+    """
+    outcomes = {}
+    public_ids = list(public_ids)
+    try:
+        cloudinary = _cloudinary()
+        for start in range(0, len(public_ids), DELETE_BATCH_SIZE):
+            batch = public_ids[start:start + DELETE_BATCH_SIZE]
+            result = cloudinary.api.delete_resources(batch, resource_type="image", type="upload", timeout=_timeout())
+            outcomes.update(result.get("deleted", {}))
+        return outcomes
+    except Exception as e:
+        raise Exception(f"Failed to delete images from Cloudinary: {str(e)}")
+
+def list_images(folder=UPLOAD_FOLDER, next_cursor=None, max_results=500):
+    """
+    List one page of uploaded images in a folder
+
+    Args:
+        folder: The folder to list
+        next_cursor: Cursor returned by the previous page, if any
+        max_results: Page size (Admin API maximum is 500)
+
+    Returns:
+        dict: "resources" (public_id, created_at, ...) and "next_cursor" when more pages exist
+    """
+    try:
+        cloudinary = _cloudinary()
+        options = {"type": "upload", "prefix": f"{folder}/", "max_results": max_results}
+        if next_cursor:
+            options["next_cursor"] = next_cursor
+        return cloudinary.api.resources(resource_type="image", timeout=_timeout(), **options)
+    except Exception as e:
+        raise Exception(f"Failed to list images from Cloudinary: {str(e)}")
+
 def get_image_url(public_id, transformation=None):
     """
     Get the URL for an image with optional transformations
@@ -78,6 +144,7 @@ def get_image_url(public_id, transformation=None):
         str: The image URL
     """
     try:
+        cloudinary = _cloudinary()
         if transformation:
             return cloudinary.CloudinaryImage(public_id).build_url(transformation=transformation)
         else:
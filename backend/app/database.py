@@ -1,28 +1,133 @@
-import os
+import time
+import asyncio
+import warnings
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
+from pymongo.compression_support import validate_compressors
+from pymongo.topology_description import TopologyDescription
 from typing import Optional
-from dotenv import load_dotenv
 
-load_dotenv()
+from .settings import get_settings
 
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database = None
+    ready: bool = False
+    ready_checked_at: float = 0.0
+    ready_detail: Optional[str] = None
+    ready_lock: Optional[asyncio.Lock] = None
 
 database = Database()
 
 async def get_database() -> AsyncIOMotorClient:
     return database.database
 
+def _available_compressors() -> list:
+    """Filter configured compressors down to the ones this pymongo build can use"""
+    configured = [c.strip() for c in get_settings().mongodb_compressors.split(",") if c.strip()]
+    # pymongo's own check knows which module each version needs (zstandard, backports.zstd, ...)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        available = validate_compressors(None, configured)
+    missing = [c for c in configured if c not in available]
+    if missing:
+        print(f"Warning: MongoDB compressors not available, skipping: {', '.join(missing)}")
+    return available
+
+async def warm_up_pool(connections: Optional[int] = None):
+    """Ping the server on several connections at once so the pool is populated before traffic"""
+    if connections is None:
+        connections = get_settings().mongodb_min_pool_size
+    pings = [database.client.admin.command("ping") for _ in range(max(connections, 1))]
+    await asyncio.gather(*pings)
+
 async def connect_to_mongo():
     """Create database connection"""
-    database.client = AsyncIOMotorClient(os.getenv("MONGODB_URL"))
-    database.database = database.client[os.getenv("DATABASE_NAME")]
-    print("Connected to MongoDB")
+    settings = get_settings()
+    compressors = _available_compressors()
+    client_options = {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "maxIdleTimeMS": settings.mongodb_max_idle_time_ms,
+        "waitQueueTimeoutMS": settings.mongodb_wait_queue_timeout_ms,
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongodb_connect_timeout_ms,
+        "timeoutMS": settings.mongodb_timeout_ms,
+        "retryWrites": True,
+        "retryReads": True,
+    }
+    if compressors:
+        client_options["compressors"] = ",".join(compressors)
+    database.client = AsyncIOMotorClient(settings.mongodb_url, **client_options)
+    database.database = database.client[settings.database_name]
+    database.ready_lock = asyncio.Lock()
+    try:
+        # Bounded so an unreachable server cannot hold up startup past the selection timeout
+        await asyncio.wait_for(warm_up_pool(), timeout=settings.mongodb_server_selection_timeout_ms / 1000)
+        _set_ready(True)
+        print(
+            f"Connected to MongoDB (pool {settings.mongodb_min_pool_size}-{settings.mongodb_max_pool_size}, "
+            f"compressors: {compressors or 'none'})"
+        )
+    except Exception as e:
+        # Keep the process up; /ready reports the failure and the driver retries in the background
+        _set_ready(False, e.__class__.__name__)
+        print(f"Warning: MongoDB warm-up failed: {e}")
 
 async def close_mongo_connection():
     """Close database connection"""
     if database.client:
         database.client.close()
+        database.client = None
+        database.database = None
+        _set_ready(False, "connection closed")
         print("Disconnected from MongoDB")
+
+def _set_ready(ready: bool, detail: Optional[str] = None):
+    database.ready = ready
+    database.ready_detail = detail
+    database.ready_checked_at = time.monotonic()
+
+async def check_database_ready() -> dict:
+    """
+    Check that the database is reachable, caching the result briefly
+
+    Concurrent probes inside the cache window share a single ping, so a burst of
+    load balancer checks never queues up behind the connection pool.
+    """
+    if database.client is None:
+        return {"ready": False, "detail": "not connected"}
+
+    settings = get_settings()
+    if time.monotonic() - database.ready_checked_at < settings.readiness_cache_seconds:
+        return {"ready": database.ready, "detail": database.ready_detail, "cached": True}
+
+    async with database.ready_lock:
+        # Another probe may have refreshed the result while we waited for the lock
+        if time.monotonic() - database.ready_checked_at < settings.readiness_cache_seconds:
+            return {"ready": database.ready, "detail": database.ready_detail, "cached": True}
+        try:
+            await asyncio.wait_for(
+                database.client.admin.command("ping"),
+                timeout=settings.readiness_ping_timeout_seconds,
+            )
+            _set_ready(True)
+        except Exception as e:
+            # Only the error type is exposed; the probe is unauthenticated
+            _set_ready(False, e.__class__.__name__)
+
+    return {"ready": database.ready, "detail": database.ready_detail, "cached": False}
+
+async def in_transaction(db, fn):
+    """
+    Run ``fn(session)`` in a transaction where the deployment supports them
+
+    A standalone server has no transactions; ``fn`` then runs with no session
+    and must stay consistent on its own (compare-and-set, idempotent writes).
+    """
+    description = getattr(db.client, "topology_description", None)
+    if not isinstance(description, TopologyDescription) or description.topology_type_name not in (
+        "ReplicaSetWithPrimary", "Sharded", "LoadBalanced"
+    ):
+        return await fn(None)
+    async with await db.client.start_session() as session:
+        return await session.with_transaction(fn)
@@ -0,0 +1,154 @@
+import asyncio
+import contextvars
+import sys
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import pymongo
+from fastapi import Request
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from .settings import get_settings
+
+# Absolute time.monotonic() by which the current request must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+# The context as it was before the request's deadline was applied
+_undeadlined_context: ContextVar[Optional[contextvars.Context]] = ContextVar("undeadlined_context", default=None)
+
+class DeadlineExceeded(Exception):
+    """The current request ran out of time before an outbound call could start"""
+
+@lru_cache()
+def _route_timeouts() -> List[Tuple[str, str, float]]:
+    """ROUTE_TIMEOUTS parsed into (method, path prefix, seconds), longest prefix first"""
+    routes = []
+    for entry in get_settings().route_timeouts.split(","):
+        if not entry.strip():
+            continue
+        try:
+            route, seconds = entry.rsplit("=", 1)
+            method, prefix = route.split(None, 1)
+            routes.append((method.upper(), prefix.strip(), float(seconds)))
+        except ValueError:
+            print(f"Warning: ignoring malformed ROUTE_TIMEOUTS entry {entry!r}")
+    return sorted(routes, key=lambda route: len(route[1]), reverse=True)
+
+def route_timeout(method: str, path: str) -> float:
+    """Seconds a request to ``method path`` may take"""
+    for route_method, prefix, seconds in _route_timeouts():
+        if route_method == method and path.startswith(prefix):
+            return seconds
+    return get_settings().request_timeout_seconds
+
+def remaining(default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before the current request's deadline
+
+    Returns ``default`` outside a request (background jobs). Raises
+    DeadlineExceeded once the deadline has passed, so no new outbound call
+    is started for a request that is already lost.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded()
+    return left
+
+def detached_context() -> contextvars.Context:
+    """
+    A context without the request's deadline
+
+    For work shared between requests (singleflight calls): it must not be cut
+    short by whichever request happened to start it. It is a copy of the
+    context DeadlineMiddleware saved before applying the deadline, since
+    pymongo.timeout(None) cannot lift an enclosing one. Each request still
+    gives up waiting at its own deadline, and the database work stays bounded
+    by the client's timeoutMS.
+    """
+    context = _undeadlined_context.get()
+    return context.copy() if context is not None else contextvars.copy_context()
+
+def is_timeout(exc: Optional[BaseException]) -> bool:
+    """Whether ``exc`` or anything in its cause/context chain is a timeout"""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, (DeadlineExceeded, asyncio.TimeoutError, TimeoutError)):
+            return True
+        if isinstance(exc, pymongo.errors.PyMongoError) and exc.timeout:
+            return True
+        # Only consult libraries that are already loaded; both are imported lazily
+        httpx = sys.modules.get("httpx")
+        if httpx is not None and isinstance(exc, httpx.TimeoutException):
+            return True
+        urllib3 = sys.modules.get("urllib3")
+        if urllib3 is not None and isinstance(exc, urllib3.exceptions.TimeoutError):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+TIMEOUT_RESPONSE = {"detail": "Request timed out"}
+
+async def timeout_exception_handler(request: Request, exc: StarletteHTTPException):
+    """
+    Report errors caused by a timeout as 504
+
+    Handlers turn unexpected exceptions into a catch-all 400 or 500; when the
+    underlying exception was a deadline, driver or client timeout the client
+    gets a Gateway Timeout instead.
+    """
+    if exc.status_code in (400, 500) and is_timeout(exc):
+        return JSONResponse(status_code=504, content=TIMEOUT_RESPONSE)
+    return await http_exception_handler(request, exc)
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(status_code=504, content=TIMEOUT_RESPONSE)
+
+class DeadlineMiddleware:
+    """
+    Give every HTTP request a deadline and answer 504 when it passes
+
+    The deadline is published to ``pymongo.timeout`` (Motor copies the context
+    into its executor, so every operation gets a matching maxTimeMS) and to
+    :func:`remaining` for Cloudinary and GitHub calls. When it passes the
+    handler is cancelled, which releases its pool connections, upload slot
+    and singleflight follower, and a 504 is sent if no response started yet.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = route_timeout(scope["method"], scope["path"])
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        context_token = _undeadlined_context.set(contextvars.copy_context())
+        token = _deadline.set(time.monotonic() + timeout)
+        try:
+            with pymongo.timeout(timeout):
+                await asyncio.wait_for(self.app(scope, receive, send_wrapper), timeout)
+        except asyncio.TimeoutError:
+            if response_started:
+                # Too late for a clean status; the server closes the truncated response
+                raise
+            response = JSONResponse(status_code=504, content=TIMEOUT_RESPONSE)
+            await response(scope, receive, send)
+        finally:
+            _deadline.reset(token)
+            _undeadlined_context.reset(context_token)
@@ -0,0 +1,27 @@
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+_client: Optional["httpx.AsyncClient"] = None
+
+def get_http_client() -> "httpx.AsyncClient":
+    """
+    Return the shared outbound HTTP client, creating it on first use
+
+    Reusing one client keeps TLS connections to GitHub alive between logins
+    instead of paying a handshake on every callback.
+    """
+    global _client
+    if _client is None:
+        import httpx
+        from .settings import get_settings
+        _client = httpx.AsyncClient(timeout=get_settings().http_timeout_seconds)
+    return _client
+
+async def close_http_client():
+    """Close the shared HTTP client if it was ever created"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
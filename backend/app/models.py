@@ -1,10 +1,15 @@
-from pydantic import BaseModel, Field, GetJsonSchemaHandler
+from pydantic import BaseModel, Field, GetJsonSchemaHandler, TypeAdapter
 from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import core_schema
-from typing import Optional, Any, Literal
+from typing import Annotated, Optional, Any, List, Literal
 from datetime import datetime
 from bson import ObjectId
 
+ApplicationStatus = Literal["Pending", "Not Hiring", "Rejected", "Accepted", "Followed up"]
+
+# Most applications one batch create accepts
+MAX_BATCH_APPLICATIONS = 100
+
 
 class PyObjectId(ObjectId):
     @classmethod
@@ -37,9 +42,7 @@ class JobApplication(BaseModel):
     photo_public_id: Optional[str] = None
     photo_url: Optional[str] = None
     notes: Optional[str] = Field(None, max_length=1000)
-    status: Literal["Pending", "Not Hiring", "Rejected", "Accepted", "Followed up"] = Field(
-        default="Pending"
-    )
+    status: ApplicationStatus = Field(default="Pending")
 
     model_config = {
         "populate_by_name": True,
@@ -114,37 +117,26 @@ class EmailTemplateCreate(BaseModel):
 
 
 class EmailTemplateUpdate(BaseModel):
-    name: Optional[str] = None
-    subject: Optional[str] = None
-    body: Optional[str] = None
-    username: str = Field(..., min_length=1, max_length=100)
-    email: Optional[str] = None
-    avatar_url: Optional[str] = None
-    name: Optional[str] = Field(None, max_length=200)
+    name: Optional[str] = Field(None, min_length=1, max_length=150)
+    subject: Optional[str] = Field(None, max_length=200)
+    body: Optional[str] = Field(None, max_length=5000)
 
     model_config = {
         "json_schema_extra": {
             "example": {
-                "github_id": 12345,
-                "username": "johndoe",
-                "email": "john@example.com",
-                "avatar_url": "https://avatars.githubusercontent.com/u/12345",
-                "name": "John Doe"
+                "subject": "Following up on my application",
             }
         }
     }
 
 
 class JobApplicationCreate(BaseModel):
-    user_id: PyObjectId = Field(...)
     company_name: str = Field(..., min_length=1, max_length=100)
     link: Optional[str] = Field(None, max_length=500)
     link_type: Optional[str] = Field(None, max_length=50)
     date_of_applying: datetime
     notes: Optional[str] = Field(None, max_length=1000)
-    status: Literal["Pending", "Not Hiring", "Rejected", "Accepted", "Followed up"] = Field(
-        default="Pending"
-    )
+    status: ApplicationStatus = Field(default="Pending")
 
     model_config = {
         "json_schema_extra": {
@@ -164,10 +156,8 @@ class JobApplicationUpdate(BaseModel):
     link: Optional[str] = Field(None, max_length=500)
     link_type: Optional[str] = Field(None, max_length=50)
     date_of_applying: Optional[datetime] = None
-    photo_public_id: Optional[str] = None
-    photo_url: Optional[str] = None
     notes: Optional[str] = Field(None, max_length=1000)
-    status: Optional[Literal["Pending", "Not Hiring", "Rejected", "Accepted", "Followed up"]] = None
+    status: Optional[ApplicationStatus] = None
 
     model_config = {
         "json_schema_extra": {
@@ -180,3 +170,26 @@ class JobApplicationUpdate(BaseModel):
             }
         }
     }
+
+
+class ReminderSettingsUpdate(BaseModel):
+    # Template rendered into each new follow-up reminder; None turns rendering off
+    template_id: Optional[str] = None
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "template_id": "65a1f0c2e4b0a1b2c3d4e5f6"
+            }
+        }
+    }
+
+
+# Request bodies are validated against these directly (validate_json) by the
+# application routes; building the validators once here keeps schema
+# construction off the request path.
+application_create_adapter = TypeAdapter(JobApplicationCreate)
+application_batch_adapter = TypeAdapter(
+    Annotated[List[JobApplicationCreate], Field(min_length=1, max_length=MAX_BATCH_APPLICATIONS)]
+)
+application_update_adapter = TypeAdapter(JobApplicationUpdate)
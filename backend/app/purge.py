@@ -0,0 +1,188 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from pymongo import ASCENDING, UpdateOne
+
+from .archive import ARCHIVE_COLLECTION
+from .cloudinary_config import delete_images, list_images
+from .scheduler import Lease, LeaseLost
+from .settings import get_settings
+
+SWEEP_STATE_ID = "orphan_sweep"
+# Outcomes after which an image is gone for good
+DELETED_OUTCOMES = {"deleted", "not_found"}
+
+async def ensure_indexes(db):
+    """Indexes backing the purge scan and orphan lookups"""
+    # Only soft-deleted documents carry a date in deleted_at, so the index stays tiny
+    await db.applications.create_index(
+        [("deleted_at", ASCENDING)],
+        name="deleted_at_purge",
+        partialFilterExpression={"deleted_at": {"$type": "date"}},
+    )
+    await db.applications.create_index("photo_public_id", sparse=True)
+    await db.image_deletions.create_index("public_id", unique=True)
+
+async def enqueue_image_deletions(db, public_ids: Iterable[str]):
+    """Queue images for the purger instead of deleting them on the request path"""
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"public_id": public_id},
+            {"$setOnInsert": {"public_id": public_id, "enqueued_at": now, "attempts": 0}},
+            upsert=True,
+        )
+        for public_id in {p for p in public_ids if p}
+    ]
+    if operations:
+        await db.image_deletions.bulk_write(operations, ordered=False)
+
+async def _referenced_images(db, public_ids: list) -> set:
+    """The images among ``public_ids`` that a live, soft-deleted or archived application still uses"""
+    query = {"photo_public_id": {"$in": public_ids}}
+    referenced = set(await db.applications.distinct("photo_public_id", query))
+    referenced.update(await db[ARCHIVE_COLLECTION].distinct("photo_public_id", query))
+    return referenced
+
+async def _delete_images(public_ids: list) -> set:
+    """Delete images off the event loop; returns the ids that are confirmed gone"""
+    if not public_ids:
+        return set()
+    outcomes = await asyncio.to_thread(delete_images, public_ids)
+    return {public_id for public_id, outcome in outcomes.items() if outcome in DELETED_OUTCOMES}
+
+async def drain_image_deletions(db, lease: Lease):
+    """Delete queued images in batches, keeping failures queued for the next run"""
+    batch_size = get_settings().purge_batch_size
+    max_attempts = get_settings().purge_max_attempts
+    last_id = None
+    while True:
+        query = {"attempts": {"$lt": max_attempts}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db.image_deletions.find(query).sort("_id", ASCENDING).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            return
+        public_ids = [item["public_id"] for item in batch]
+        # Identical photos are shared between applications; one still in use stays, and
+        # whoever drops the last reference queues it again
+        in_use = await _referenced_images(db, public_ids)
+        if in_use:
+            await db.image_deletions.delete_many({"public_id": {"$in": list(in_use)}})
+            public_ids = [p for p in public_ids if p not in in_use]
+        try:
+            gone = await _delete_images(public_ids)
+        except Exception as e:
+            print(f"Warning: image deletion batch failed: {e}")
+            gone = set()
+        if gone:
+            await db.image_deletions.delete_many({"public_id": {"$in": list(gone)}})
+        failed = [p for p in public_ids if p not in gone]
+        if failed:
+            await db.image_deletions.update_many({"public_id": {"$in": failed}}, {"$inc": {"attempts": 1}})
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1]["_id"]
+        if not await lease.renew():
+            raise LeaseLost(lease.name)
+
+async def purge_deleted_applications(db, lease: Lease):
+    """
+    Hard-delete applications soft-deleted more than PURGE_GRACE_DAYS ago
+
+    Their images go through the deletion queue first, so a Cloudinary outage
+    never blocks the purge or loses track of an image.
+    """
+    settings = get_settings()
+    cutoff = datetime.utcnow() - timedelta(days=settings.purge_grace_days)
+    while True:
+        batch = await db.applications.find(
+            {"deleted_at": {"$lte": cutoff}},
+            {"photo_public_id": 1},
+        ).sort("deleted_at", ASCENDING).limit(settings.purge_batch_size).to_list(length=settings.purge_batch_size)
+        if not batch:
+            break
+        await enqueue_image_deletions(db, [doc.get("photo_public_id") for doc in batch])
+        ids = [doc["_id"] for doc in batch]
+        # Re-check deleted_at so an application restored mid-batch survives
+        await db.applications.delete_many({"_id": {"$in": ids}, "deleted_at": {"$lte": cutoff}})
+        await db.reminders.delete_many({"application_id": {"$in": ids}})
+        if len(batch) < settings.purge_batch_size:
+            break
+        if not await lease.renew():
+            raise LeaseLost(lease.name)
+
+    await drain_image_deletions(db, lease)
+
+async def purge_local(repos):
+    """
+    The purge for the SQLite backend: hard-delete expired soft deletes and drain the image queue
+
+    The same steps as purge_deleted_applications and drain_image_deletions,
+    through the repository instead of a MongoDB handle. Runs in every worker
+    without a lease; both steps tolerate running twice.
+    """
+    settings = get_settings()
+    applications = repos.applications
+    cutoff = datetime.utcnow() - timedelta(days=settings.purge_grace_days)
+    while await applications.purge_deleted(cutoff, settings.purge_batch_size) == settings.purge_batch_size:
+        pass
+
+    after = None
+    while True:
+        page, public_ids = await applications.take_image_deletions(
+            after, settings.purge_batch_size, settings.purge_max_attempts
+        )
+        if not page:
+            return
+        try:
+            gone = await _delete_images(public_ids)
+        except Exception as e:
+            print(f"Warning: image deletion batch failed: {e}")
+            gone = set()
+        await applications.finish_image_deletions(gone, [p for p in public_ids if p not in gone])
+        if len(page) < settings.purge_batch_size:
+            return
+        after = page[-1]
+
+async def sweep_orphaned_images(db, lease: Lease):
+    """
+    Remove Cloudinary images that no application references
+
+    Pages through the upload folder, resuming from a cursor persisted in
+    ``scheduler_state``, and checks each page against ``photo_public_id``
+    (soft-deleted and archived applications included; the purger owns the
+    former). Images newer than ORPHAN_MIN_AGE_HOURS are skipped so uploads
+    whose application insert is still in flight are never mistaken for orphans.
+    """
+    settings = get_settings()
+    min_created = datetime.utcnow() - timedelta(hours=settings.orphan_min_age_hours)
+
+    state = await db.scheduler_state.find_one({"_id": SWEEP_STATE_ID}) or {}
+    next_cursor = state.get("next_cursor")
+    while True:
+        page = await asyncio.to_thread(list_images, next_cursor=next_cursor)
+        candidates = [
+            resource["public_id"]
+            for resource in page.get("resources", [])
+            if datetime.strptime(resource["created_at"], "%Y-%m-%dT%H:%M:%SZ") < min_created
+        ]
+        if candidates:
+            referenced = await _referenced_images(db, candidates)
+            orphans = [public_id for public_id in candidates if public_id not in referenced]
+            if orphans:
+                await enqueue_image_deletions(db, orphans)
+
+        next_cursor = page.get("next_cursor")
+        await db.scheduler_state.update_one(
+            {"_id": SWEEP_STATE_ID},
+            {"$set": {"next_cursor": next_cursor, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+        if not next_cursor:
+            break
+        if not await lease.renew():
+            raise LeaseLost(lease.name)
+
+    await drain_image_deletions(db, lease)
@@ -0,0 +1,208 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from pymongo import ReturnDocument
+
+from .auth import get_current_user
+from .settings import get_settings
+
+@dataclass
+class BucketLimit:
+    """Token bucket shape: ``rate`` tokens refill per second up to ``burst``"""
+    rate: float
+    burst: float
+
+def _limit(scope: str) -> BucketLimit:
+    """Resolve a scope name to its configured bucket"""
+    settings = get_settings()
+    per_minute, burst = {
+        "api": (settings.rate_limit_user_per_minute, settings.rate_limit_user_burst),
+        "applications.write": (settings.rate_limit_write_per_minute, settings.rate_limit_write_burst),
+        "applications.batch": (settings.rate_limit_batch_per_minute, settings.rate_limit_batch_burst),
+        "auth.callback": (settings.rate_limit_auth_ip_per_minute, settings.rate_limit_auth_ip_burst),
+    }[scope]
+    return BucketLimit(rate=per_minute / 60, burst=burst)
+
+class MemoryRateLimitBackend:
+    """Per-process buckets; exact within one worker, approximate across several"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, limit: BucketLimit, cost: float = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated_at) * limit.rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        # Least recently used buckets are the most likely to be full again anyway
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, tokens
+
+class MongoRateLimitBackend:
+    """
+    Buckets shared by every worker, stored in the ``rate_limits`` collection
+
+    Refill and take happen in one pipeline update against the server clock
+    ($$NOW), so concurrent workers never race or disagree about elapsed time.
+    Idle buckets are removed by a TTL index on ``expires_at``.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.collection = db.rate_limits
+        self._indexed = False
+
+    async def take(self, key: str, limit: BucketLimit, cost: float = 1) -> Tuple[bool, float]:
+        if not self._indexed:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+
+        elapsed_seconds = {"$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$updated_at", "$$NOW"]}]}, 1000]}
+        refilled = {"$min": [limit.burst, {"$add": [{"$ifNull": ["$tokens", limit.burst]}, {"$multiply": [elapsed_seconds, limit.rate]}]}]}
+        # Once the bucket would be full again the document carries no state and can expire
+        idle_ms = math.ceil(limit.burst / limit.rate * 1000)
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": "$$NOW"}},
+                {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                    "expires_at": {"$add": ["$$NOW", idle_ms]},
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc["allowed"], doc["tokens"]
+
+_memory_backend = MemoryRateLimitBackend()
+_mongo_backend: Optional[MongoRateLimitBackend] = None
+
+def get_rate_limit_backend():
+    """Backend selected by RATE_LIMIT_BACKEND ("memory" or "mongo")"""
+    global _mongo_backend
+    if get_settings().rate_limit_backend == "mongo":
+        from .database import database
+        if database.database is not None:
+            if _mongo_backend is None or _mongo_backend.db is not database.database:
+                _mongo_backend = MongoRateLimitBackend(database.database)
+            return _mongo_backend
+    return _memory_backend
+
+async def check_rate_limit(key: str, scope: str, cost: float = 1):
+    """Take ``cost`` tokens from the bucket for ``key`` or raise 429 with Retry-After"""
+    limit = _limit(scope)
+    if cost > limit.burst:
+        # The bucket never holds this many tokens; waiting would not help
+        raise HTTPException(
+            status_code=413,
+            detail=f"Request costs {cost:g} but the {scope} limit allows at most {limit.burst:g} at once",
+        )
+    try:
+        allowed, tokens = await get_rate_limit_backend().take(f"{scope}:{key}", limit, cost)
+    except Exception as e:
+        # Fail open: an unreachable shared store must not take the API down with it
+        print(f"Warning: rate limit check failed for {scope}: {e}")
+        return
+    if not allowed:
+        retry_after = max(1, math.ceil((cost - tokens) / limit.rate))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+def limit_user(scope: str, cost: float = 1):
+    """Dependency limiting the authenticated user; returns the current user like ``get_current_user``"""
+    async def dependency(current_user: dict = Depends(get_current_user)):
+        await check_rate_limit(f"user:{current_user['user_id']}", scope, cost)
+        return current_user
+    return dependency
+
+def limit_ip(scope: str, cost: float = 1):
+    """
+    Dependency limiting the client address, for routes called before login
+
+    Behind a proxy the address comes from X-Forwarded-For, which uvicorn only
+    honours for peers in FORWARDED_ALLOW_IPS.
+    """
+    async def dependency(request: Request):
+        client_ip = request.client.host if request.client else "unknown"
+        await check_rate_limit(f"ip:{client_ip}", scope, cost)
+    return dependency
+
+class ConcurrencyLimiter:
+    """
+    Cap how many requests run an expensive section at once in this worker
+
+    Requests beyond ``limit`` wait up to ``queue_timeout`` seconds for a slot;
+    when the wait times out, or ``max_queue`` requests are already waiting, the
+    request is shed with 503 and Retry-After instead of piling onto the backlog.
+    """
+
+    def __init__(self, name: str, limit: int, queue_timeout: float, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    def _overloaded(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(max(1, math.ceil(self.queue_timeout)))},
+        )
+
+    async def acquire(self):
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            raise self._overloaded()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._overloaded()
+        finally:
+            self.waiting -= 1
+
+    def release(self):
+        self._semaphore.release()
+
+_limiters = {}
+
+def _get_limiter(name: str) -> ConcurrencyLimiter:
+    limiter = _limiters.get(name)
+    if limiter is None:
+        settings = get_settings()
+        limit, queue_timeout, max_queue = {
+            "uploads": (
+                settings.upload_concurrency,
+                settings.upload_queue_timeout_seconds,
+                settings.upload_max_queue,
+            ),
+        }[name]
+        limiter = _limiters[name] = ConcurrencyLimiter(name, limit, queue_timeout, max_queue)
+    return limiter
+
+def concurrency_limit(name: str):
+    """Dependency holding one of the named limiter's slots for the duration of the request"""
+    async def dependency():
+        limiter = _get_limiter(name)
+        await limiter.acquire()
+        try:
+            yield
+        finally:
+            limiter.release()
+    return dependency
@@ -0,0 +1,190 @@
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from .scheduler import Lease, LeaseLost
+from .settings import get_settings
+
+WATERMARK_ID = "reminders"
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+SCAN_PROJECTION = {"user_id": 1, "company_name": 1, "link": 1, "link_type": 1, "status": 1, "date_of_applying": 1}
+
+async def ensure_indexes(db):
+    """Indexes backing the due-application scan and the per-user reminder list"""
+    # Equality on status, then range + sort on (date_of_applying, _id) for the resumable scan
+    await db.applications.create_index(
+        [("status", ASCENDING), ("date_of_applying", ASCENDING), ("_id", ASCENDING)],
+        name="status_date_of_applying",
+    )
+    # One reminder per application, whichever worker or retry produced it
+    await db.reminders.create_index("application_id", unique=True)
+    await db.reminders.create_index([("user_id", ASCENDING), ("due_at", DESCENDING)])
+
+def render_template(text: Optional[str], context: dict) -> Optional[str]:
+    """Fill ``{{ name }}`` placeholders from ``context``; unknown placeholders are left as is"""
+    if text is None:
+        return None
+
+    def replace(match):
+        value = context.get(match.group(1))
+        return match.group(0) if value is None else str(value)
+
+    return PLACEHOLDER.sub(replace, text)
+
+def _template_context(application: dict, user: Optional[dict]) -> dict:
+    date_of_applying = application.get("date_of_applying")
+    return {
+        "company_name": application.get("company_name"),
+        "link": application.get("link"),
+        "link_type": application.get("link_type"),
+        "status": application.get("status"),
+        "date_of_applying": date_of_applying.date().isoformat() if date_of_applying else None,
+        "name": (user or {}).get("name") or (user or {}).get("username"),
+        "username": (user or {}).get("username"),
+        "email": (user or {}).get("email"),
+    }
+
+async def _load_templates(db, users: dict) -> dict:
+    """Chosen reminder template per user id, for the users in one batch"""
+    template_ids = {
+        user["reminder_template_id"]: user["_id"]
+        for user in users.values()
+        if user.get("reminder_template_id")
+    }
+    if not template_ids:
+        return {}
+    templates = {}
+    async for template in db.templates.find({"_id": {"$in": list(template_ids)}}):
+        # Only honour templates the user actually owns
+        if template_ids.get(template["_id"]) == template.get("user_id"):
+            templates[template["user_id"]] = template
+    return templates
+
+async def _process_batch(db, applications: list, followup_after: timedelta):
+    user_ids = list({app["user_id"] for app in applications})
+    users = {
+        user["_id"]: user
+        async for user in db.users.find(
+            {"_id": {"$in": user_ids}},
+            {"username": 1, "name": 1, "email": 1, "reminder_template_id": 1},
+        )
+    }
+    templates = await _load_templates(db, users)
+
+    now = datetime.utcnow()
+    operations = []
+    for application in applications:
+        user = users.get(application["user_id"])
+        template = templates.get(application["user_id"])
+        reminder = {
+            "user_id": application["user_id"],
+            "application_id": application["_id"],
+            "company_name": application.get("company_name"),
+            "date_of_applying": application["date_of_applying"],
+            "due_at": application["date_of_applying"] + followup_after,
+            "status": "open",
+            "template_id": template["_id"] if template else None,
+            "subject": None,
+            "body": None,
+            "created_at": now,
+        }
+        if template:
+            context = _template_context(application, user)
+            reminder["subject"] = render_template(template.get("subject"), context)
+            reminder["body"] = render_template(template.get("body"), context)
+        # $setOnInsert keeps re-runs after a crash idempotent
+        operations.append(UpdateOne(
+            {"application_id": application["_id"]},
+            {"$setOnInsert": reminder},
+            upsert=True,
+        ))
+    if operations:
+        await db.reminders.bulk_write(operations, ordered=False)
+
+async def _scan_backdated(db, since: datetime, upto_date: datetime, followup_after: timedelta, batch_size: int):
+    """Pick up applications created since ``since`` whose date is already behind the watermark"""
+    query = {
+        "_id": {"$gte": ObjectId.from_datetime(since)},
+        "status": "Pending",
+        "date_of_applying": {"$lte": upto_date},
+        "deleted_at": None,
+    }
+    last_id = None
+    while True:
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db.applications.find(query, SCAN_PROJECTION).sort("_id", ASCENDING).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            return
+        await _process_batch(db, batch, followup_after)
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1]["_id"]
+
+async def scan_due_applications(db, lease: Lease):
+    """
+    Create reminders for Pending applications that are due a follow-up
+
+    The scan walks ``(status, date_of_applying, _id)`` in index order from a
+    watermark persisted in ``scheduler_state``, one batch at a time. Every
+    application behind the watermark has already been handled, so a run only
+    touches applications that became due since the previous one, and a crashed
+    or preempted run resumes where it stopped.
+
+    Applications are often entered with a past date, landing behind the
+    watermark; a second pass over the ``_id`` range created since the previous
+    run catches those. Applications moved back to Pending after the watermark
+    has passed them are not revisited.
+    """
+    settings = get_settings()
+    followup_after = timedelta(days=settings.reminder_followup_days)
+    started_at = datetime.utcnow()
+    cutoff = started_at - followup_after
+    batch_size = settings.reminder_batch_size
+
+    state = await db.scheduler_state.find_one({"_id": WATERMARK_ID}) or {}
+    watermark_date = state.get("date_of_applying")
+    watermark_id = state.get("application_id")
+    previous_run_at = state.get("last_run_started_at")
+
+    if watermark_date is not None and previous_run_at is not None:
+        # Overlap by a lease period so inserts racing the previous run are not missed
+        since = previous_run_at - timedelta(seconds=settings.scheduler_lease_seconds)
+        await _scan_backdated(db, since, min(cutoff, watermark_date), followup_after, batch_size)
+
+    while True:
+        query = {"status": "Pending", "date_of_applying": {"$lte": cutoff}, "deleted_at": None}
+        if watermark_date is not None:
+            query["$or"] = [
+                {"date_of_applying": {"$gt": watermark_date}},
+                {"date_of_applying": watermark_date, "_id": {"$gt": watermark_id}},
+            ]
+        cursor = db.applications.find(query, SCAN_PROJECTION) \
+            .sort([("date_of_applying", ASCENDING), ("_id", ASCENDING)]) \
+            .limit(batch_size)
+        batch = await cursor.to_list(length=batch_size)
+        if not batch:
+            break
+
+        await _process_batch(db, batch, followup_after)
+
+        watermark_date = batch[-1]["date_of_applying"]
+        watermark_id = batch[-1]["_id"]
+        await db.scheduler_state.update_one(
+            {"_id": WATERMARK_ID},
+            {"$set": {"date_of_applying": watermark_date, "application_id": watermark_id, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+        if len(batch) < batch_size:
+            break
+        if not await lease.renew():
+            raise LeaseLost(lease.name)
+
+    await db.scheduler_state.update_one(
+        {"_id": WATERMARK_ID},
+        {"$set": {"last_run_started_at": started_at}},
+        upsert=True,
+    )
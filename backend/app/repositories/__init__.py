@@ -0,0 +1,50 @@
+from typing import Optional
+
+from ..database import check_database_ready, close_mongo_connection, connect_to_mongo, database
+from ..settings import get_settings
+from .base import AnalyticsRepository, ApplicationRepository, Repositories, TemplateRepository, UserRepository
+
+_repositories: Optional[Repositories] = None
+
+async def init_repositories():
+    """Open the storage backend selected by STORAGE_BACKEND ("mongo" or "sqlite")"""
+    global _repositories
+    settings = get_settings()
+    if settings.storage_backend == "sqlite":
+        from .sqlite import SQLiteRepositories, SQLiteStore
+
+        store = SQLiteStore(settings.sqlite_path, readers=settings.sqlite_readers)
+        await store.open()
+        _repositories = SQLiteRepositories(store)
+        print(f"Opened SQLite database at {settings.sqlite_path}")
+    else:
+        from .mongo import MongoRepositories
+
+        await connect_to_mongo()
+        # Indexes are created by the scheduler's setup task, retried until the database is reachable
+        _repositories = MongoRepositories(database.database)
+
+async def close_repositories():
+    global _repositories
+    if _repositories is None:
+        return
+    if _repositories.backend == "sqlite":
+        await _repositories.store.close()
+    else:
+        await close_mongo_connection()
+    _repositories = None
+
+async def get_repositories() -> Repositories:
+    return _repositories
+
+async def check_storage_ready() -> dict:
+    """Readiness of whichever backend is active"""
+    if _repositories is None:
+        return {"ready": False, "detail": "not connected"}
+    if _repositories.backend == "mongo":
+        return await check_database_ready()
+    try:
+        await _repositories.ping()
+        return {"ready": True, "detail": None}
+    except Exception as e:
+        return {"ready": False, "detail": e.__class__.__name__}
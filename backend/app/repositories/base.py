@@ -0,0 +1,157 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+# Documents cross the repository boundary shaped like MongoDB documents: "_id" and
+# "user_id" are ObjectIds and dates are naive UTC datetimes, whichever backend
+# stored them. Ids passed in are strings the routers have already validated.
+
+
+class ApplicationRepository(ABC):
+    @abstractmethod
+    async def create(self, document: dict) -> dict:
+        """Insert an application and return it with its new "_id"; records a creation event"""
+
+    @abstractmethod
+    async def create_many(self, documents: List[dict]) -> List[dict]:
+        """Insert several applications in one write, all or none where the backend allows; records their creation events"""
+
+    @abstractmethod
+    async def list(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        q: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[dict]:
+        """
+        A user's live applications, newest date_of_applying first, optionally text-searched
+
+        With ``include_archived`` archived applications (those carrying
+        "archived_at") are merged into the same ordering.
+        """
+
+    @abstractmethod
+    async def get(self, user_id: str, application_id: str) -> Optional[dict]:
+        """One live application owned by the user"""
+
+    @abstractmethod
+    async def find_by_photo_hash(self, user_id: str, photo_sha256: str) -> Optional[dict]:
+        """A live application of the user's whose photo has this SHA-256"""
+
+    @abstractmethod
+    async def update(self, user_id: str, application_id: str, fields: dict) -> Optional[dict]:
+        """
+        Set ``fields`` on a live application and return the updated document
+
+        A change of status is recorded as an event, and added to its week's
+        summary, in the same write.
+        """
+
+    @abstractmethod
+    async def soft_delete(self, user_id: str, application_id: str) -> bool:
+        """Mark a live application deleted; False if there was none"""
+
+    @abstractmethod
+    async def restore(self, user_id: str, application_id: str) -> bool:
+        """Clear the deleted mark on a soft-deleted application"""
+
+    @abstractmethod
+    async def queue_image_deletions(self, public_ids: Iterable[str]):
+        """Hand images that are no longer referenced to the background purger"""
+
+    async def get_archived(self, user_id: str, application_id: str) -> Optional[dict]:
+        """One archived application owned by the user; backends without an archive have none"""
+        return None
+
+    async def unarchive(self, user_id: str, application_id: str) -> bool:
+        """Move an archived application back among the live ones; False if it was not archived"""
+        return False
+
+
+class TemplateRepository(ABC):
+    @abstractmethod
+    async def create(self, document: dict) -> dict:
+        """Insert a template and return it with its new "_id" """
+
+    @abstractmethod
+    async def list(self, user_id: str) -> List[dict]:
+        """A user's templates, most recently created first"""
+
+    @abstractmethod
+    async def get(self, user_id: str, template_id: str) -> Optional[dict]:
+        """One template owned by the user"""
+
+    @abstractmethod
+    async def update(self, user_id: str, template_id: str, fields: dict) -> Optional[dict]:
+        """Set ``fields`` on a template and return the updated document"""
+
+    @abstractmethod
+    async def delete(self, user_id: str, template_id: str) -> bool:
+        """Delete a template; False if there was none"""
+
+
+class UserRepository(ABC):
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[dict]:
+        """A user by id"""
+
+    @abstractmethod
+    async def find_by_github_id(self, github_id: int) -> Optional[dict]:
+        """A user by GitHub account id"""
+
+    @abstractmethod
+    async def create(self, document: dict) -> dict:
+        """Insert a user and return it with its new "_id" """
+
+    @abstractmethod
+    async def update_by_github_id(self, github_id: int, fields: dict):
+        """Set ``fields`` on the user with this GitHub account id"""
+
+
+class AnalyticsRepository(ABC):
+    @abstractmethod
+    async def summaries(self, user_id: str, since: Optional[datetime] = None) -> List[dict]:
+        """A user's weekly summaries ("week_start", "counts") from the week starting ``since``"""
+
+    @abstractmethod
+    async def events(
+        self,
+        user_id: str,
+        limit: int = 50,
+        before: Optional[datetime] = None,
+        before_id: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        A user's status-change events, newest first (ties on "ts" broken by "_id")
+
+        Pass the last event's "ts" and "_id" as ``before`` and ``before_id`` for
+        the next page; events of one batch share a "ts", so ``before`` alone
+        would skip the rest of them.
+        """
+
+
+class Repositories(ABC):
+    """The storage backend as the routers see it"""
+
+    backend: str = ""
+
+    def __init__(
+        self,
+        applications: ApplicationRepository,
+        templates: TemplateRepository,
+        users: UserRepository,
+        analytics: AnalyticsRepository,
+    ):
+        self.applications = applications
+        self.templates = templates
+        self.users = users
+        self.analytics = analytics
+
+    @abstractmethod
+    async def ping(self):
+        """Raise if the backend cannot serve requests"""
+
+    async def ensure_indexes(self):
+        """Create indexes the request path relies on"""
@@ -0,0 +1,288 @@
+import asyncio
+import heapq
+import itertools
+import re
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+
+from ..analytics import creation_event, event_counters, status_change_event, week_start
+from ..archive import ARCHIVE_COLLECTION
+from ..database import in_transaction
+from .base import AnalyticsRepository, ApplicationRepository, Repositories, TemplateRepository, UserRepository
+
+# Attempts at a status change that keeps losing the race to a concurrent one
+STATUS_CHANGE_ATTEMPTS = 3
+
+
+async def _record_events(db, events: List[Tuple[dict, bool]], session=None):
+    """Append status-change events, given with their first_time flag, and add them to their weeks' summaries"""
+    await db.application_events.insert_many([event for event, _ in events], session=session)
+    summaries = {}
+    for event, first_time in events:
+        week = week_start(event["ts"])
+        summary = summaries.setdefault((event["user_id"], week), {})
+        for key, count in event_counters(event, first_time).items():
+            summary[f"counts.{key}"] = summary.get(f"counts.{key}", 0) + count
+    await db.activity_weekly.bulk_write(
+        [
+            UpdateOne(
+                {"_id": f"{user_id}:{week:%Y-%m-%d}"},
+                {"$inc": counts, "$setOnInsert": {"user_id": user_id, "week_start": week}},
+                upsert=True,
+            )
+            for (user_id, week), counts in summaries.items()
+        ],
+        ordered=False,
+        session=session,
+    )
+
+
+class MongoApplicationRepository(ApplicationRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def create(self, document: dict) -> dict:
+        return (await self.create_many([document]))[0]
+
+    async def create_many(self, documents: List[dict]) -> List[dict]:
+        now = datetime.utcnow()
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            document.setdefault("status_changed_at", now)
+            document.setdefault("statuses_reached", [document["status"]])
+
+        async def write(session):
+            await self.db.applications.insert_many(documents, session=session)
+            await _record_events(self.db, [(creation_event(document, now), True) for document in documents], session)
+
+        await in_transaction(self.db, write)
+        return documents
+
+    async def list(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        q: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[dict]:
+        query = {"user_id": ObjectId(user_id), "deleted_at": None}
+        if q:
+            pattern = re.compile(re.escape(q), re.IGNORECASE)
+            query["$or"] = [{"company_name": pattern}, {"notes": pattern}]
+        if not include_archived:
+            cursor = self.db.applications.find(query).skip(skip).limit(limit).sort("date_of_applying", -1)
+            return [doc async for doc in cursor]
+
+        # Neither side can contribute more than skip + limit documents to the page, so
+        # each is read that far in the shared order and the two runs are merged
+        window = skip + limit
+        hot, cold = await asyncio.gather(
+            self.db.applications.find(query).sort("date_of_applying", -1).limit(window).to_list(length=window),
+            self.db[ARCHIVE_COLLECTION].find(query).sort("date_of_applying", -1).limit(window).to_list(length=window),
+        )
+        merged = heapq.merge(hot, cold, key=lambda doc: doc["date_of_applying"], reverse=True)
+        return list(itertools.islice(merged, skip, window))
+
+    async def get(self, user_id: str, application_id: str) -> Optional[dict]:
+        return await self.db.applications.find_one({
+            "_id": ObjectId(application_id),
+            "user_id": ObjectId(user_id),
+            "deleted_at": None,
+        })
+
+    async def find_by_photo_hash(self, user_id: str, photo_sha256: str) -> Optional[dict]:
+        return await self.db.applications.find_one(
+            {"user_id": ObjectId(user_id), "photo_sha256": photo_sha256, "deleted_at": None},
+            {"photo_public_id": 1, "photo_url": 1},
+        )
+
+    async def update(self, user_id: str, application_id: str, fields: dict) -> Optional[dict]:
+        if not fields:
+            return await self.get(user_id, application_id)
+        query = {"_id": ObjectId(application_id), "user_id": ObjectId(user_id), "deleted_at": None}
+        if "status" not in fields:
+            return await self.db.applications.find_one_and_update(
+                query, {"$set": fields}, return_document=ReturnDocument.AFTER
+            )
+
+        status = fields["status"]
+        for _ in range(STATUS_CHANGE_ATTEMPTS):
+            now = datetime.utcnow()
+
+            async def write(session):
+                """Returns the updated document and whether a concurrent change forces a retry"""
+                before = await self.db.applications.find_one(query, session=session)
+                if before is None:
+                    return None, False
+                if before.get("status") == status:
+                    after = await self.db.applications.find_one_and_update(
+                        query, {"$set": fields}, return_document=ReturnDocument.AFTER, session=session
+                    )
+                    return after, False
+                reached = before.get("statuses_reached") or [before.get("status")]
+                first_time = status not in reached
+                changes = {
+                    **fields,
+                    "status_changed_at": now,
+                    "statuses_reached": reached + [status] if first_time else reached,
+                }
+                # Only if the status is still the one the event says it moved from
+                after = await self.db.applications.find_one_and_update(
+                    {**query, "status": before.get("status")},
+                    {"$set": changes},
+                    return_document=ReturnDocument.AFTER,
+                    session=session,
+                )
+                if after is None:
+                    return None, True
+                await _record_events(self.db, [(status_change_event(before, status, now), first_time)], session)
+                return after, False
+
+            after, retry = await in_transaction(self.db, write)
+            if not retry:
+                return after
+        raise Exception("Application status was changed concurrently; try again")
+
+    async def soft_delete(self, user_id: str, application_id: str) -> bool:
+        result = await self.db.applications.update_one(
+            {"_id": ObjectId(application_id), "user_id": ObjectId(user_id), "deleted_at": None},
+            {"$set": {"deleted_at": datetime.utcnow()}},
+        )
+        return result.matched_count == 1
+
+    async def restore(self, user_id: str, application_id: str) -> bool:
+        result = await self.db.applications.update_one(
+            {"_id": ObjectId(application_id), "user_id": ObjectId(user_id), "deleted_at": {"$ne": None}},
+            {"$unset": {"deleted_at": ""}},
+        )
+        return result.matched_count == 1
+
+    async def get_archived(self, user_id: str, application_id: str) -> Optional[dict]:
+        return await self.db[ARCHIVE_COLLECTION].find_one({
+            "_id": ObjectId(application_id),
+            "user_id": ObjectId(user_id),
+        })
+
+    async def unarchive(self, user_id: str, application_id: str) -> bool:
+        query = {"_id": ObjectId(application_id), "user_id": ObjectId(user_id)}
+
+        async def move(session):
+            document = await self.db[ARCHIVE_COLLECTION].find_one(query, session=session)
+            if document is None:
+                return False
+            document.pop("archived_at", None)
+            await self.db.applications.replace_one({"_id": document["_id"]}, document, upsert=True, session=session)
+            await self.db[ARCHIVE_COLLECTION].delete_one(query, session=session)
+            return True
+
+        return await in_transaction(self.db, move)
+
+    async def queue_image_deletions(self, public_ids: Iterable[str]):
+        from ..purge import enqueue_image_deletions
+        await enqueue_image_deletions(self.db, public_ids)
+
+
+class MongoTemplateRepository(TemplateRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def create(self, document: dict) -> dict:
+        result = await self.db.templates.insert_one(document)
+        document["_id"] = result.inserted_id
+        return document
+
+    async def list(self, user_id: str) -> List[dict]:
+        cursor = self.db.templates.find({"user_id": ObjectId(user_id)}).sort("created_at", -1)
+        return [doc async for doc in cursor]
+
+    async def get(self, user_id: str, template_id: str) -> Optional[dict]:
+        return await self.db.templates.find_one({"_id": ObjectId(template_id), "user_id": ObjectId(user_id)})
+
+    async def update(self, user_id: str, template_id: str, fields: dict) -> Optional[dict]:
+        if not fields:
+            return await self.get(user_id, template_id)
+        return await self.db.templates.find_one_and_update(
+            {"_id": ObjectId(template_id), "user_id": ObjectId(user_id)},
+            {"$set": fields},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def delete(self, user_id: str, template_id: str) -> bool:
+        result = await self.db.templates.delete_one({"_id": ObjectId(template_id), "user_id": ObjectId(user_id)})
+        return result.deleted_count == 1
+
+
+class MongoUserRepository(UserRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        return await self.db.users.find_one({"_id": ObjectId(user_id)})
+
+    async def find_by_github_id(self, github_id: int) -> Optional[dict]:
+        return await self.db.users.find_one({"github_id": github_id})
+
+    async def create(self, document: dict) -> dict:
+        result = await self.db.users.insert_one(document)
+        document["_id"] = result.inserted_id
+        return document
+
+    async def update_by_github_id(self, github_id: int, fields: dict):
+        await self.db.users.update_one({"github_id": github_id}, {"$set": fields})
+
+
+class MongoAnalyticsRepository(AnalyticsRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def summaries(self, user_id: str, since: Optional[datetime] = None) -> List[dict]:
+        query = {"user_id": ObjectId(user_id)}
+        if since is not None:
+            query["week_start"] = {"$gte": since}
+        cursor = self.db.activity_weekly.find(query, {"_id": 0, "week_start": 1, "counts": 1})
+        return [doc async for doc in cursor.sort("week_start", ASCENDING)]
+
+    async def events(
+        self,
+        user_id: str,
+        limit: int = 50,
+        before: Optional[datetime] = None,
+        before_id: Optional[str] = None,
+    ) -> List[dict]:
+        query = {"user_id": ObjectId(user_id)}
+        if before is not None and before_id is not None:
+            query["$or"] = [{"ts": {"$lt": before}}, {"ts": before, "_id": {"$lt": ObjectId(before_id)}}]
+        elif before is not None:
+            query["ts"] = {"$lt": before}
+        cursor = self.db.application_events.find(query).sort([("ts", DESCENDING), ("_id", DESCENDING)]).limit(limit)
+        return [doc async for doc in cursor]
+
+
+class MongoRepositories(Repositories):
+    backend = "mongo"
+
+    def __init__(self, db):
+        super().__init__(
+            MongoApplicationRepository(db),
+            MongoTemplateRepository(db),
+            MongoUserRepository(db),
+            MongoAnalyticsRepository(db),
+        )
+        self.db = db
+
+    async def ping(self):
+        await self.db.command("ping")
+
+    async def ensure_indexes(self):
+        # Only applications with a photo carry a hash, so the index stays small
+        await self.db.applications.create_index(
+            [("user_id", ASCENDING), ("photo_sha256", ASCENDING)],
+            name="user_photo_sha256",
+            partialFilterExpression={"photo_sha256": {"$type": "string"}},
+        )
+        await self.db.application_events.create_index([("user_id", ASCENDING), ("ts", ASCENDING), ("_id", ASCENDING)])
+        await self.db.activity_weekly.create_index([("user_id", ASCENDING), ("week_start", ASCENDING)])
@@ -0,0 +1,672 @@
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+
+from ..analytics import creation_event, event_counters, status_change_event, week_start
+from .base import AnalyticsRepository, ApplicationRepository, Repositories, TemplateRepository, UserRepository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    github_id INTEGER UNIQUE,
+    username TEXT,
+    email TEXT,
+    avatar_url TEXT,
+    name TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    extra TEXT
+);
+
+CREATE TABLE IF NOT EXISTS applications (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    link TEXT,
+    link_type TEXT,
+    date_of_applying TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    photo_public_id TEXT,
+    photo_url TEXT,
+    photo_sha256 TEXT,
+    notes TEXT,
+    status_changed_at TEXT,
+    deleted_at TEXT,
+    extra TEXT
+);
+
+-- Serves the list query's filter and sort; the page of seqs is read from the
+-- index alone before any table row is touched
+CREATE INDEX IF NOT EXISTS applications_user_date
+    ON applications (user_id, date_of_applying DESC) WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS applications_user_photo
+    ON applications (user_id, photo_sha256) WHERE photo_sha256 IS NOT NULL;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+    company_name, notes,
+    content='applications', content_rowid='seq',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS applications_fts_insert AFTER INSERT ON applications BEGIN
+    INSERT INTO applications_fts (rowid, company_name, notes) VALUES (new.seq, new.company_name, new.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications BEGIN
+    INSERT INTO applications_fts (applications_fts, rowid, company_name, notes)
+        VALUES ('delete', old.seq, old.company_name, old.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS applications_fts_update AFTER UPDATE OF company_name, notes ON applications BEGIN
+    INSERT INTO applications_fts (applications_fts, rowid, company_name, notes)
+        VALUES ('delete', old.seq, old.company_name, old.notes);
+    INSERT INTO applications_fts (rowid, company_name, notes) VALUES (new.seq, new.company_name, new.notes);
+END;
+
+CREATE TABLE IF NOT EXISTS templates (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    subject TEXT,
+    body TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    extra TEXT
+);
+
+CREATE INDEX IF NOT EXISTS templates_user_created ON templates (user_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS application_events (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    application_id TEXT NOT NULL,
+    from_status TEXT,
+    to_status TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    hours_in_status REAL,
+    extra TEXT
+);
+
+DROP INDEX IF EXISTS application_events_user_ts;
+CREATE INDEX IF NOT EXISTS application_events_user_ts_id ON application_events (user_id, ts, id);
+
+-- One row per counter per user-week; see app/analytics.py for the counter names
+CREATE TABLE IF NOT EXISTS activity_weekly (
+    user_id TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    counter TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, week_start, counter)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS image_deletions (
+    public_id TEXT PRIMARY KEY,
+    enqueued_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Columns added after a table was first released; CREATE TABLE IF NOT EXISTS
+# leaves existing databases without them, so open() adds them
+ADDED_COLUMNS = [
+    ("applications", "photo_sha256", "TEXT"),
+    ("applications", "status_changed_at", "TEXT"),
+]
+
+
+class SQLiteStore:
+    """
+    An SQLite database in WAL mode with one writer thread and a pool of readers
+
+    All writes run on a single dedicated thread, so transactions in this
+    process never contend with each other and never block the event loop.
+    Reads run on a separate thread pool with one read-only connection per
+    thread; under WAL they proceed concurrently with the writer.
+    """
+
+    def __init__(self, path: str, readers: int = 4):
+        self.path = path
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="sqlite-reader")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        # isolation_level=None: transactions are explicit, see _run_write
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 5000")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -16000")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn.execute("PRAGMA journal_mode = WAL")
+            # Durable at checkpoints; WAL keeps the database consistent on power loss
+            conn.execute("PRAGMA synchronous = NORMAL")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _connection(self, readonly: bool) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect(readonly)
+        return conn
+
+    def _run_read(self, fn: Callable, args: tuple):
+        return fn(self._connection(readonly=True), *args)
+
+    def _run_write(self, fn: Callable, args: tuple):
+        conn = self._connection(readonly=False)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn, *args)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    async def read(self, fn: Callable, *args):
+        """Run ``fn(conn, *args)`` on a reader connection"""
+        return await asyncio.get_running_loop().run_in_executor(self._readers, self._run_read, fn, args)
+
+    async def write(self, fn: Callable, *args):
+        """Run ``fn(conn, *args)`` in one transaction on the writer thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._writer, self._run_write, fn, args)
+
+    async def open(self):
+        """Create the schema; readers connect lazily afterwards"""
+        def create_schema(conn):
+            for table, column, column_type in ADDED_COLUMNS:
+                existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+                # An empty result means the table does not exist yet; SCHEMA creates it whole
+                if existing and column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            conn.executescript(SCHEMA)
+
+        # executescript manages its own transaction, so bypass _run_write
+        await asyncio.get_running_loop().run_in_executor(
+            self._writer, lambda: create_schema(self._connection(readonly=False))
+        )
+
+    async def close(self):
+        def optimize(conn):
+            conn.execute("PRAGMA optimize")
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._writer, lambda: optimize(self._connection(readonly=False))
+            )
+        finally:
+            self._writer.shutdown(wait=True)
+            self._readers.shutdown(wait=True)
+            with self._connections_lock:
+                for conn in self._connections:
+                    conn.close()
+                self._connections.clear()
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    """Store datetimes as naive UTC ISO strings, which sort chronologically"""
+    if value is None or isinstance(value, str):
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds")
+
+
+def _from_text(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class _Table:
+    """Maps Mongo-shaped documents onto one table; unknown fields live in ``extra`` as JSON"""
+
+    def __init__(self, name: str, columns: List[str], date_columns: List[str], id_columns: List[str]):
+        self.name = name
+        self.columns = columns
+        self.date_columns = set(date_columns)
+        self.id_columns = set(id_columns)
+
+    def to_row(self, document: dict) -> dict:
+        row = {"id": str(document["_id"])}
+        extra = {}
+        for key, value in document.items():
+            if key == "_id":
+                continue
+            if key in self.date_columns:
+                row[key] = _to_text(value)
+            elif key in self.id_columns:
+                row[key] = str(value) if value is not None else None
+            elif key in self.columns:
+                row[key] = value
+            else:
+                extra[key] = value
+        row["extra"] = json.dumps(extra, default=str) if extra else None
+        return row
+
+    def to_document(self, row: sqlite3.Row) -> dict:
+        document = {"_id": ObjectId(row["id"])}
+        for key in self.columns:
+            value = row[key]
+            if key in self.date_columns:
+                value = _from_text(value)
+            elif key in self.id_columns and value is not None:
+                value = ObjectId(value)
+            if key == "deleted_at" and value is None:
+                continue
+            document[key] = value
+        if row["extra"]:
+            document.update(json.loads(row["extra"]))
+        return document
+
+    def insert(self, conn: sqlite3.Connection, document: dict):
+        row = self.to_row(document)
+        names = ", ".join(row)
+        placeholders = ", ".join(f":{name}" for name in row)
+        conn.execute(f"INSERT INTO {self.name} ({names}) VALUES ({placeholders})", row)
+
+    def replace(self, conn: sqlite3.Connection, document: dict):
+        row = self.to_row(document)
+        # Columns missing from the document are cleared, like a full Mongo replace
+        for column in self.columns:
+            row.setdefault(column, None)
+        assignments = ", ".join(f"{name} = :{name}" for name in row if name != "id")
+        conn.execute(f"UPDATE {self.name} SET {assignments} WHERE id = :id", row)
+
+
+APPLICATIONS = _Table(
+    "applications",
+    ["user_id", "company_name", "link", "link_type", "date_of_applying", "status",
+     "photo_public_id", "photo_url", "photo_sha256", "notes", "status_changed_at", "deleted_at"],
+    date_columns=["date_of_applying", "status_changed_at", "deleted_at"],
+    id_columns=["user_id"],
+)
+TEMPLATES = _Table(
+    "templates",
+    ["user_id", "name", "subject", "body", "created_at", "updated_at"],
+    date_columns=["created_at", "updated_at"],
+    id_columns=["user_id"],
+)
+USERS = _Table(
+    "users",
+    ["github_id", "username", "email", "avatar_url", "name", "created_at", "updated_at"],
+    date_columns=["created_at", "updated_at"],
+    id_columns=[],
+)
+EVENTS = _Table(
+    "application_events",
+    ["user_id", "application_id", "from_status", "to_status", "ts", "hours_in_status"],
+    date_columns=["ts"],
+    id_columns=["user_id", "application_id"],
+)
+
+
+def _fts_query(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 prefix query, quoting every token"""
+    tokens = re.findall(r"\w+", q)
+    return " ".join(f'"{token}"*' for token in tokens) or None
+
+
+def _merge(conn: sqlite3.Connection, table: _Table, where: str, params: tuple, fields: dict) -> Optional[dict]:
+    """Read-modify-write one row inside the writer's transaction"""
+    row = conn.execute(f"SELECT * FROM {table.name} WHERE {where}", params).fetchone()
+    if row is None:
+        return None
+    document = table.to_document(row)
+    document.update(fields)
+    table.replace(conn, document)
+    return document
+
+
+def _record_event(conn: sqlite3.Connection, event: dict, first_time: bool):
+    """Append a status-change event and add it to its week's summary"""
+    event.setdefault("_id", ObjectId())
+    EVENTS.insert(conn, event)
+    week = _to_text(week_start(event["ts"]))
+    conn.executemany(
+        """
+        INSERT INTO activity_weekly (user_id, week_start, counter, count) VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_id, week_start, counter) DO UPDATE SET count = count + excluded.count
+        """,
+        [(str(event["user_id"]), week, key, count) for key, count in event_counters(event, first_time).items()],
+    )
+
+
+def _update_application(conn: sqlite3.Connection, user_id: str, application_id: str, fields: dict) -> Optional[dict]:
+    """Apply ``fields`` and record a status change, all inside the writer's transaction"""
+    row = conn.execute(
+        "SELECT * FROM applications WHERE id = ? AND user_id = ? AND deleted_at IS NULL", (application_id, user_id)
+    ).fetchone()
+    if row is None:
+        return None
+    before = APPLICATIONS.to_document(row)
+    document = {**before, **fields}
+    status = fields.get("status")
+    event = None
+    if status is not None and status != before.get("status"):
+        now = datetime.utcnow()
+        reached = before.get("statuses_reached") or [before.get("status")]
+        first_time = status not in reached
+        document["status_changed_at"] = now
+        document["statuses_reached"] = reached + [status] if first_time else reached
+        event = status_change_event(before, status, now)
+    APPLICATIONS.replace(conn, document)
+    if event is not None:
+        _record_event(conn, event, first_time)
+    return document
+
+
+class SQLiteApplicationRepository(ApplicationRepository):
+    def __init__(self, store: SQLiteStore):
+        self.store = store
+
+    async def create(self, document: dict) -> dict:
+        return (await self.create_many([document]))[0]
+
+    async def create_many(self, documents: List[dict]) -> List[dict]:
+        now = datetime.utcnow()
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            document.setdefault("status_changed_at", now)
+            document.setdefault("statuses_reached", [document["status"]])
+
+        def insert(conn):
+            for document in documents:
+                APPLICATIONS.insert(conn, document)
+                _record_event(conn, creation_event(document, now), True)
+
+        await self.store.write(insert)
+        return documents
+
+    async def list(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        q: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> List[dict]:
+        # Nothing is ever archived here; include_archived has nothing to add
+        match = _fts_query(q) if q else None
+
+        def query(conn):
+            if match:
+                rows = conn.execute(
+                    """
+                    SELECT a.* FROM applications_fts f
+                    JOIN applications a ON a.seq = f.rowid
+                    WHERE applications_fts MATCH ? AND a.user_id = ? AND a.deleted_at IS NULL
+                    ORDER BY a.date_of_applying DESC LIMIT ? OFFSET ?
+                    """,
+                    (match, user_id, limit, skip),
+                )
+            else:
+                # Page through the covering index first, then fetch only the rows on the page
+                rows = conn.execute(
+                    """
+                    SELECT a.* FROM (
+                        SELECT seq FROM applications
+                        WHERE user_id = ? AND deleted_at IS NULL
+                        ORDER BY date_of_applying DESC LIMIT ? OFFSET ?
+                    ) page
+                    JOIN applications a ON a.seq = page.seq
+                    ORDER BY a.date_of_applying DESC
+                    """,
+                    (user_id, limit, skip),
+                )
+            return [APPLICATIONS.to_document(row) for row in rows]
+
+        return await self.store.read(query)
+
+    async def get(self, user_id: str, application_id: str) -> Optional[dict]:
+        def query(conn):
+            row = conn.execute(
+                "SELECT * FROM applications WHERE id = ? AND user_id = ? AND deleted_at IS NULL",
+                (application_id, user_id),
+            ).fetchone()
+            return APPLICATIONS.to_document(row) if row else None
+
+        return await self.store.read(query)
+
+    async def find_by_photo_hash(self, user_id: str, photo_sha256: str) -> Optional[dict]:
+        def query(conn):
+            row = conn.execute(
+                "SELECT * FROM applications WHERE user_id = ? AND photo_sha256 = ? AND deleted_at IS NULL LIMIT 1",
+                (user_id, photo_sha256),
+            ).fetchone()
+            return APPLICATIONS.to_document(row) if row else None
+
+        return await self.store.read(query)
+
+    async def update(self, user_id: str, application_id: str, fields: dict) -> Optional[dict]:
+        return await self.store.write(_update_application, user_id, application_id, fields)
+
+    async def soft_delete(self, user_id: str, application_id: str) -> bool:
+        def query(conn):
+            return conn.execute(
+                "UPDATE applications SET deleted_at = ? WHERE id = ? AND user_id = ? AND deleted_at IS NULL",
+                (_to_text(datetime.utcnow()), application_id, user_id),
+            ).rowcount == 1
+
+        return await self.store.write(query)
+
+    async def restore(self, user_id: str, application_id: str) -> bool:
+        def query(conn):
+            return conn.execute(
+                "UPDATE applications SET deleted_at = NULL WHERE id = ? AND user_id = ? AND deleted_at IS NOT NULL",
+                (application_id, user_id),
+            ).rowcount == 1
+
+        return await self.store.write(query)
+
+    async def queue_image_deletions(self, public_ids: Iterable[str]):
+        now = _to_text(datetime.utcnow())
+        rows = [(public_id, now) for public_id in {p for p in public_ids if p}]
+        if rows:
+            await self.store.write(
+                lambda conn: conn.executemany(
+                    "INSERT OR IGNORE INTO image_deletions (public_id, enqueued_at) VALUES (?, ?)", rows
+                )
+            )
+
+    # The purger for this backend (app.purge.purge_local) works through these
+    # rather than through a MongoDB handle
+
+    async def purge_deleted(self, before: datetime, limit: int) -> int:
+        """Hard-delete up to ``limit`` applications soft-deleted at or before ``before``, queueing their images"""
+        def purge(conn):
+            rows = conn.execute(
+                """
+                SELECT seq, photo_public_id FROM applications
+                WHERE deleted_at IS NOT NULL AND deleted_at <= ? ORDER BY deleted_at LIMIT ?
+                """,
+                (_to_text(before), limit),
+            ).fetchall()
+            now = _to_text(datetime.utcnow())
+            conn.executemany(
+                "INSERT OR IGNORE INTO image_deletions (public_id, enqueued_at) VALUES (?, ?)",
+                [(row["photo_public_id"], now) for row in rows if row["photo_public_id"]],
+            )
+            conn.executemany("DELETE FROM applications WHERE seq = ?", [(row["seq"],) for row in rows])
+            return len(rows)
+
+        return await self.store.write(purge)
+
+    async def take_image_deletions(
+        self, after: Optional[str], limit: int, max_attempts: int
+    ) -> Tuple[List[str], List[str]]:
+        """
+        The next page of the deletion queue, in public_id order after ``after``
+
+        Returns (page, deletable). Images still referenced by an application
+        leave the queue here; deletable holds the rest of the page.
+        """
+        def take(conn):
+            page = [
+                row["public_id"]
+                for row in conn.execute(
+                    "SELECT public_id FROM image_deletions WHERE attempts < ? AND public_id > ? "
+                    "ORDER BY public_id LIMIT ?",
+                    (max_attempts, after or "", limit),
+                )
+            ]
+            if not page:
+                return page, []
+            placeholders = ",".join("?" * len(page))
+            in_use = {
+                row[0]
+                for row in conn.execute(
+                    f"SELECT DISTINCT photo_public_id FROM applications WHERE photo_public_id IN ({placeholders})", page
+                )
+            }
+            conn.executemany("DELETE FROM image_deletions WHERE public_id = ?", [(p,) for p in in_use])
+            return page, [p for p in page if p not in in_use]
+
+        return await self.store.write(take)
+
+    async def finish_image_deletions(self, gone: Iterable[str], failed: Iterable[str]):
+        """Drop images that are gone from the queue and count a failed attempt for the others"""
+        def finish(conn):
+            conn.executemany("DELETE FROM image_deletions WHERE public_id = ?", [(p,) for p in gone])
+            conn.executemany(
+                "UPDATE image_deletions SET attempts = attempts + 1 WHERE public_id = ?", [(p,) for p in failed]
+            )
+
+        await self.store.write(finish)
+
+
+class SQLiteTemplateRepository(TemplateRepository):
+    def __init__(self, store: SQLiteStore):
+        self.store = store
+
+    async def create(self, document: dict) -> dict:
+        document.setdefault("_id", ObjectId())
+        await self.store.write(TEMPLATES.insert, document)
+        return document
+
+    async def list(self, user_id: str) -> List[dict]:
+        def query(conn):
+            rows = conn.execute(
+                "SELECT * FROM templates WHERE user_id = ? ORDER BY created_at DESC", (user_id,)
+            )
+            return [TEMPLATES.to_document(row) for row in rows]
+
+        return await self.store.read(query)
+
+    async def get(self, user_id: str, template_id: str) -> Optional[dict]:
+        def query(conn):
+            row = conn.execute(
+                "SELECT * FROM templates WHERE id = ? AND user_id = ?", (template_id, user_id)
+            ).fetchone()
+            return TEMPLATES.to_document(row) if row else None
+
+        return await self.store.read(query)
+
+    async def update(self, user_id: str, template_id: str, fields: dict) -> Optional[dict]:
+        return await self.store.write(_merge, TEMPLATES, "id = ? AND user_id = ?", (template_id, user_id), fields)
+
+    async def delete(self, user_id: str, template_id: str) -> bool:
+        def query(conn):
+            return conn.execute(
+                "DELETE FROM templates WHERE id = ? AND user_id = ?", (template_id, user_id)
+            ).rowcount == 1
+
+        return await self.store.write(query)
+
+
+class SQLiteUserRepository(UserRepository):
+    def __init__(self, store: SQLiteStore):
+        self.store = store
+
+    async def _find(self, where: str, params: tuple) -> Optional[dict]:
+        def query(conn):
+            row = conn.execute(f"SELECT * FROM users WHERE {where}", params).fetchone()
+            return USERS.to_document(row) if row else None
+
+        return await self.store.read(query)
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        return await self._find("id = ?", (user_id,))
+
+    async def find_by_github_id(self, github_id: int) -> Optional[dict]:
+        return await self._find("github_id = ?", (github_id,))
+
+    async def create(self, document: dict) -> dict:
+        document.setdefault("_id", ObjectId())
+        await self.store.write(USERS.insert, document)
+        return document
+
+    async def update_by_github_id(self, github_id: int, fields: dict):
+        await self.store.write(_merge, USERS, "github_id = ?", (github_id,), fields)
+
+
+class SQLiteAnalyticsRepository(AnalyticsRepository):
+    def __init__(self, store: SQLiteStore):
+        self.store = store
+
+    async def summaries(self, user_id: str, since: Optional[datetime] = None) -> List[dict]:
+        def query(conn):
+            rows = conn.execute(
+                "SELECT week_start, counter, count FROM activity_weekly WHERE user_id = ? AND week_start >= ?"
+                " ORDER BY week_start",
+                (user_id, _to_text(since) or ""),
+            )
+            weeks = {}
+            for row in rows:
+                week = weeks.setdefault(row["week_start"], {"week_start": _from_text(row["week_start"]), "counts": {}})
+                week["counts"][row["counter"]] = row["count"]
+            return list(weeks.values())
+
+        return await self.store.read(query)
+
+    async def events(
+        self,
+        user_id: str,
+        limit: int = 50,
+        before: Optional[datetime] = None,
+        before_id: Optional[str] = None,
+    ) -> List[dict]:
+        def query(conn):
+            # Ids are ObjectId hex strings, so they sort like ObjectIds; "" sorts before
+            # any of them, so without before_id every event at ``before`` is excluded
+            rows = conn.execute(
+                "SELECT * FROM application_events WHERE user_id = ? AND (ts, id) < (?, ?)"
+                " ORDER BY ts DESC, id DESC LIMIT ?",
+                (user_id, _to_text(before) or "9999", str(ObjectId(before_id)) if before_id else "", limit),
+            )
+            return [EVENTS.to_document(row) for row in rows]
+
+        return await self.store.read(query)
+
+
+class SQLiteRepositories(Repositories):
+    backend = "sqlite"
+
+    def __init__(self, store: SQLiteStore):
+        super().__init__(
+            SQLiteApplicationRepository(store),
+            SQLiteTemplateRepository(store),
+            SQLiteUserRepository(store),
+            SQLiteAnalyticsRepository(store),
+        )
+        self.store = store
+
+    async def ping(self):
+        await self.store.read(lambda conn: conn.execute("SELECT 1").fetchone())
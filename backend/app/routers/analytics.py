@@ -0,0 +1,102 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from datetime import datetime, timedelta
+from bson import ObjectId
+
+from ..repositories import Repositories, get_repositories
+from ..auth import get_current_user
+from ..singleflight import reads
+from ..ratelimit import limit_user
+from ..analytics import funnel, sum_counters, time_in_status, week_start, weekly_activity
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+    dependencies=[Depends(limit_user("api"))],
+)
+
+
+def _since(weeks: Optional[int]) -> Optional[datetime]:
+    """Start of the window covering the current week and the ``weeks - 1`` before it"""
+    if weeks is None:
+        return None
+    return week_start(datetime.utcnow()) - timedelta(weeks=weeks - 1)
+
+
+def serialize_event(document: dict) -> dict:
+    data = {**document}
+    for key in ("_id", "user_id", "application_id"):
+        if data.get(key) is not None:
+            data[key] = str(data[key])
+    return data
+
+
+@router.get("/funnel")
+async def get_funnel(
+    weeks: Optional[int] = Query(None, ge=1, le=520),
+    current_user: dict = Depends(get_current_user),
+    repos: Repositories = Depends(get_repositories),
+):
+    """How many applications reached each status, overall or over the last ``weeks`` weeks"""
+    try:
+        async def load():
+            return funnel(sum_counters(await repos.analytics.summaries(current_user["user_id"], _since(weeks))))
+
+        return await reads.do_json(reads.make_key(current_user["user_id"], "analytics.funnel", weeks=weeks), load)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/time-in-status")
+async def get_time_in_status(
+    weeks: Optional[int] = Query(None, ge=1, le=520),
+    current_user: dict = Depends(get_current_user),
+    repos: Repositories = Depends(get_repositories),
+):
+    """Approximate median hours an application spends in each status before moving on"""
+    try:
+        async def load():
+            return time_in_status(sum_counters(await repos.analytics.summaries(current_user["user_id"], _since(weeks))))
+
+        return await reads.do_json(reads.make_key(current_user["user_id"], "analytics.time_in_status", weeks=weeks), load)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/weekly")
+async def get_weekly_activity(
+    weeks: int = Query(12, ge=1, le=520),
+    current_user: dict = Depends(get_current_user),
+    repos: Repositories = Depends(get_repositories),
+):
+    """Applications created and status changes per week; weeks without activity are omitted"""
+    try:
+        async def load():
+            return weekly_activity(await repos.analytics.summaries(current_user["user_id"], _since(weeks)))
+
+        return await reads.do_json(reads.make_key(current_user["user_id"], "analytics.weekly", weeks=weeks), load)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/events")
+async def list_events(
+    limit: int = Query(50, ge=1, le=500),
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    repos: Repositories = Depends(get_repositories),
+):
+    """Status-change history, newest first; pass the last ``ts`` and ``_id`` as ``before`` and ``before_id`` for the next page"""
+    try:
+        if before_id is not None and not ObjectId.is_valid(before_id):
+            raise HTTPException(status_code=400, detail="Invalid event ID")
+
+        events = await repos.analytics.events(
+            current_user["user_id"], limit=limit, before=before, before_id=before_id
+        )
+        return [serialize_event(event) for event in events]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
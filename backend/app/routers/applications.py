@@ -1,14 +1,61 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Form
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 from typing import List, Optional
 from bson import ObjectId
-from datetime import datetime
 
-from ..database import get_database
-from ..models import JobApplication, JobApplicationCreate, JobApplicationUpdate
-from ..cloudinary_config import upload_image, delete_image
+from ..repositories import Repositories, get_repositories
+from ..models import (
+    MAX_BATCH_APPLICATIONS,
+    JobApplicationCreate,
+    JobApplicationUpdate,
+    application_batch_adapter,
+    application_create_adapter,
+    application_update_adapter,
+)
+from ..uploads import MAX_JSON_BYTES, read_body, read_photo_upload, store_photo
 from ..auth import get_current_user
+from ..singleflight import reads
+from ..ratelimit import check_rate_limit, limit_user, concurrency_limit
 
-router = APIRouter(prefix="/applications", tags=["applications"])
+router = APIRouter(
+    prefix="/applications",
+    tags=["applications"],
+    dependencies=[Depends(limit_user("api"))],
+)
+
+# Bodies are read and validated by the precompiled adapters in models rather than
+# declared as parameters, so describe them here
+def _body_schema(content_type: str, schema: dict) -> dict:
+    return {"requestBody": {"required": True, "content": {content_type: {"schema": schema}}}}
+
+PHOTO_FORM_SCHEMA = {
+    "type": "object",
+    "properties": {"photo": {"type": "string", "format": "binary"}},
+    "required": ["photo"],
+}
+
+async def _validate_body(request: Request, adapter: TypeAdapter):
+    """Validate a JSON body straight from its bytes; errors come back as a regular 422"""
+    body = await read_body(request, MAX_JSON_BYTES)
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        # Same locations FastAPI reports for a body parameter, e.g. ["body", "company_name"]
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+# Fields an update may clear with null; a null anywhere else is ignored
+CLEARABLE_FIELDS = {"link", "link_type", "notes"}
+
+def _new_application(user_id: str, payload: JobApplicationCreate) -> dict:
+    return {
+        "user_id": ObjectId(user_id),
+        **payload.model_dump(),
+        "photo_public_id": None,
+        "photo_url": None,
+    }
 
 def serialize_application_document(document: dict) -> dict:
     """Convert MongoDB document fields to JSON-serializable types."""
@@ -21,56 +68,62 @@ def serialize_application_document(document: dict) -> dict:
         serialized["user_id"] = str(serialized["user_id"])
     return serialized
 
-@router.post("/")
+async def _get_live_application(repos: Repositories, user_id: str, application_id: str) -> Optional[dict]:
+    """A live application, brought back from the archive first if that is where it is"""
+    application = await repos.applications.get(user_id, application_id)
+    if application is None and await repos.applications.unarchive(user_id, application_id):
+        application = await repos.applications.get(user_id, application_id)
+    return application
+
+@router.post(
+    "/",
+    dependencies=[Depends(limit_user("applications.write"))],
+    openapi_extra=_body_schema("application/json", JobApplicationCreate.model_json_schema()),
+)
 async def create_application(
-    company_name: str = Form(...),
-    link: Optional[str] = Form(None),
-    link_type: Optional[str] = Form(None),
-    date_of_applying: str = Form(...),
-    status: Optional[str] = Form("Pending"),
-    notes: Optional[str] = Form(None),
-    photo: Optional[UploadFile] = File(None),
+    request: Request,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database)
+    repos: Repositories = Depends(get_repositories)
 ):
-    """Create a new job application"""
+    """Create a new job application; attach a photo afterwards with PUT /{id}/photo"""
+    payload = await _validate_body(request, application_create_adapter)
     try:
-        # Parse date
-        date_obj = datetime.fromisoformat(date_of_applying.replace('Z', '+00:00'))
-        
-        # Handle file upload to Cloudinary
-        photo_public_id = None
-        photo_url = None
-        if photo and photo.filename:
-            # Upload to Cloudinary
-            upload_result = upload_image(photo.file)
-            photo_public_id = upload_result["public_id"]
-            photo_url = upload_result["secure_url"]
-        
-        # Validate status
-        allowed_statuses = {"Pending", "Not Hiring", "Rejected", "Accepted", "Followed up"}
-        if status is None or status not in allowed_statuses:
-            status = "Pending"
-
-        # Create application data
-        application_data = {
-            "user_id": ObjectId(current_user["user_id"]),
-            "company_name": company_name,
-            "link": link,
-            "link_type": link_type,
-            "date_of_applying": date_obj,
-            "status": status,
-            "photo_public_id": photo_public_id,
-            "photo_url": photo_url,
-            "notes": notes
-        }
-        
-        # Insert into database
-        result = await db.applications.insert_one(application_data)
-        application_data["_id"] = result.inserted_id
+        application_data = await repos.applications.create(_new_application(current_user["user_id"], payload))
+        reads.invalidate(current_user["user_id"])
         
         return serialize_application_document(application_data)
     
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post(
+    "/batch",
+    openapi_extra=_body_schema(
+        "application/json",
+        {"type": "array", "items": JobApplicationCreate.model_json_schema(), "maxItems": MAX_BATCH_APPLICATIONS},
+    ),
+)
+async def create_applications(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    repos: Repositories = Depends(get_repositories)
+):
+    """Create several job applications at once, e.g. an import"""
+    payloads = await _validate_body(request, application_batch_adapter)
+    # Every application in the batch counts against the batch budget
+    await check_rate_limit(f"user:{current_user['user_id']}", "applications.batch", cost=len(payloads))
+    try:
+        created = await repos.applications.create_many(
+            [_new_application(current_user["user_id"], payload) for payload in payloads]
+        )
+        reads.invalidate(current_user["user_id"])
+        
+        return [serialize_application_document(doc) for doc in created]
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -78,17 +131,26 @@ async def create_application(
 async def get_applications(
     skip: int = 0,
     limit: int = 100,
+    q: Optional[str] = None,
+    include_archived: bool = False,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database)
+    repos: Repositories = Depends(get_repositories)
 ):
-    """Get all job applications for the current user"""
+    """Get all job applications for the current user, optionally with archived ones"""
     try:
-        user_id = ObjectId(current_user["user_id"])
-        cursor = db.applications.find({"user_id": user_id}).skip(skip).limit(limit).sort("date_of_applying", -1)
-        applications: List[dict] = []
-        async for doc in cursor:
-            applications.append(serialize_application_document(doc))
-        return applications
+        async def load_applications():
+            documents = await repos.applications.list(
+                current_user["user_id"], skip=skip, limit=limit, q=q, include_archived=include_archived
+            )
+            applications: List[dict] = [serialize_application_document(doc) for doc in documents]
+            return applications
+
+        # Identical concurrent reads (several tabs, remounts) share one query
+        key = reads.make_key(
+            current_user["user_id"], "applications.list",
+            skip=skip, limit=limit, q=q, include_archived=include_archived,
+        )
+        return await reads.do_json(key, load_applications)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -96,18 +158,16 @@ async def get_applications(
 async def get_application(
     application_id: str,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database)
+    repos: Repositories = Depends(get_repositories)
 ):
     """Get a single job application by ID"""
     try:
         if not ObjectId.is_valid(application_id):
             raise HTTPException(status_code=400, detail="Invalid application ID")
         
-        user_id = ObjectId(current_user["user_id"])
-        application = await db.applications.find_one({
-            "_id": ObjectId(application_id),
-            "user_id": user_id
-        })
+        application = await repos.applications.get(current_user["user_id"], application_id)
+        if not application:
+            application = await repos.applications.get_archived(current_user["user_id"], application_id)
         if not application:
             raise HTTPException(status_code=404, detail="Application not found")
         
@@ -117,119 +177,143 @@ async def get_application(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.put("/{application_id}")
+@router.put(
+    "/{application_id}",
+    dependencies=[Depends(limit_user("applications.write"))],
+    openapi_extra=_body_schema("application/json", JobApplicationUpdate.model_json_schema()),
+)
 async def update_application(
     application_id: str,
-    company_name: Optional[str] = Form(None),
-    link: Optional[str] = Form(None),
-    link_type: Optional[str] = Form(None),
-    date_of_applying: Optional[str] = Form(None),
-    status: Optional[str] = Form(None),
-    notes: Optional[str] = Form(None),
-    photo: Optional[UploadFile] = File(None),
+    request: Request,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database)
+    repos: Repositories = Depends(get_repositories)
 ):
     """Update a job application"""
+    if not ObjectId.is_valid(application_id):
+        raise HTTPException(status_code=400, detail="Invalid application ID")
+    
+    payload = await _validate_body(request, application_update_adapter)
     try:
-        if not ObjectId.is_valid(application_id):
-            raise HTTPException(status_code=400, detail="Invalid application ID")
-        
-        # Check if application exists and belongs to user
-        user_id = ObjectId(current_user["user_id"])
-        existing_app = await db.applications.find_one({
-            "_id": ObjectId(application_id),
-            "user_id": user_id
-        })
-        if not existing_app:
+        update_data = {
+            field: value
+            for field, value in payload.model_dump(exclude_unset=True).items()
+            if value is not None or field in CLEARABLE_FIELDS
+        }
+        # Editing an archived application makes it live again
+        if not await _get_live_application(repos, current_user["user_id"], application_id):
             raise HTTPException(status_code=404, detail="Application not found")
         
-        # Prepare update data
-        update_data = {}
-        if company_name is not None:
-            update_data["company_name"] = company_name
-        if link is not None:
-            update_data["link"] = link
-        if link_type is not None:
-            update_data["link_type"] = link_type
-        if date_of_applying is not None:
-            update_data["date_of_applying"] = datetime.fromisoformat(date_of_applying.replace('Z', '+00:00'))
-        if notes is not None:
-            update_data["notes"] = notes
-        if status is not None:
-            allowed_statuses = {"Pending", "Not Hiring", "Rejected", "Accepted", "Followed up"}
-            if status in allowed_statuses:
-                update_data["status"] = status
+        # Update in database and return the updated application
+        updated_app = await repos.applications.update(current_user["user_id"], application_id, update_data)
+        if not updated_app:
+            raise HTTPException(status_code=404, detail="Application not found")
+        reads.invalidate(current_user["user_id"])
         
-        # Handle file upload to Cloudinary
-        if photo and photo.filename:
-            # Delete old photo from Cloudinary if exists
-            if existing_app.get("photo_public_id"):
-                try:
-                    delete_image(existing_app["photo_public_id"])
-                except Exception as e:
-                    print(f"Warning: Failed to delete old image: {e}")
-            
-            # Upload new photo to Cloudinary
-            upload_result = upload_image(photo.file)
-            update_data["photo_public_id"] = upload_result["public_id"]
-            update_data["photo_url"] = upload_result["secure_url"]
+        return serialize_application_document(updated_app)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put(
+    "/{application_id}/photo",
+    # Per-user write budget first, so rejected callers never occupy an upload slot
+    dependencies=[Depends(limit_user("applications.write")), Depends(concurrency_limit("uploads"))],
+    openapi_extra=_body_schema("multipart/form-data", PHOTO_FORM_SCHEMA),
+)
+async def upload_application_photo(
+    application_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    repos: Repositories = Depends(get_repositories)
+):
+    """Attach or replace the photo of a job application"""
+    if not ObjectId.is_valid(application_id):
+        raise HTTPException(status_code=400, detail="Invalid application ID")
+    
+    # Check if application exists and belongs to user before reading the body;
+    # editing an archived application makes it live again
+    existing_app = await _get_live_application(repos, current_user["user_id"], application_id)
+    if not existing_app:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    # Rejects oversized bodies and non-image photos before reading the rest
+    photo = await read_photo_upload(request)
+    try:
+        if photo is None:
+            raise HTTPException(status_code=422, detail="photo is required")
+        # Nothing to do when it is the photo already attached
+        if photo.sha256 == existing_app.get("photo_sha256"):
+            return serialize_application_document(existing_app)
         
-        # Update in database
-        await db.applications.update_one(
-            {"_id": ObjectId(application_id), "user_id": user_id},
-            {"$set": update_data}
-        )
+        # Upload to Cloudinary, or reuse an identical photo the user already has
+        photo_fields = await store_photo(repos, current_user["user_id"], photo)
+        updated_app = await repos.applications.update(current_user["user_id"], application_id, photo_fields)
+        if not updated_app:
+            raise HTTPException(status_code=404, detail="Application not found")
+        reads.invalidate(current_user["user_id"])
+
+        # The old photo may no longer be referenced; the purger deletes it if so and retries on failure
+        old_public_id = existing_app.get("photo_public_id")
+        if old_public_id and photo_fields["photo_public_id"] != old_public_id:
+            await repos.applications.queue_image_deletions([old_public_id])
         
-        # Return updated application
-        updated_app = await db.applications.find_one({
-            "_id": ObjectId(application_id),
-            "user_id": user_id
-        })
         return serialize_application_document(updated_app)
     
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if photo:
+            photo.close()
 
 @router.delete("/{application_id}")
 async def delete_application(
     application_id: str,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database)
+    repos: Repositories = Depends(get_repositories)
 ):
-    """Delete a job application"""
+    """Delete a job application (restorable until the purger removes it)"""
     try:
         if not ObjectId.is_valid(application_id):
             raise HTTPException(status_code=400, detail="Invalid application ID")
         
-        # Get application to delete associated photo
-        user_id = ObjectId(current_user["user_id"])
-        application = await db.applications.find_one({
-            "_id": ObjectId(application_id),
-            "user_id": user_id
-        })
-        if not application:
+        # Mark as deleted; the photo and document are purged in the background
+        deleted = await repos.applications.soft_delete(current_user["user_id"], application_id)
+        if not deleted and await repos.applications.unarchive(current_user["user_id"], application_id):
+            deleted = await repos.applications.soft_delete(current_user["user_id"], application_id)
+        
+        if not deleted:
             raise HTTPException(status_code=404, detail="Application not found")
+        reads.invalidate(current_user["user_id"])
         
-        # Delete associated photo from Cloudinary
-        if application.get("photo_public_id"):
-            try:
-                delete_image(application["photo_public_id"])
-            except Exception as e:
-                print(f"Warning: Failed to delete image from Cloudinary: {e}")
+        return {"message": "Application deleted successfully"}
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{application_id}/restore")
+async def restore_application(
+    application_id: str,
+    current_user: dict = Depends(get_current_user),
+    repos: Repositories = Depends(get_repositories)
+):
+    """Undo a delete that has not been purged yet"""
+    try:
+        if not ObjectId.is_valid(application_id):
+            raise HTTPException(status_code=400, detail="Invalid application ID")
         
-        # Delete from database
-        result = await db.applications.delete_one({
-            "_id": ObjectId(application_id),
-            "user_id": user_id
-        })
+        restored = await repos.applications.restore(current_user["user_id"], application_id)
         
-        if result.deleted_count == 0:
-            raise HTTPException(status_code=404, detail="Application not found")
+        if not restored:
+            raise HTTPException(status_code=404, detail="Deleted application not found")
+        reads.invalidate(current_user["user_id"])
         
-        return {"message": "Application deleted successfully"}
+        return {"message": "Application restored successfully"}
     
     except HTTPException:
         raise
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException
+from bson import ObjectId
+from datetime import datetime
+
+from ..database import database
+from ..models import ReminderSettingsUpdate
+from ..auth import get_current_user
+from ..ratelimit import limit_user
+
+router = APIRouter(
+    prefix="/reminders",
+    tags=["reminders"],
+    dependencies=[Depends(limit_user("api"))],
+)
+
+
+async def get_database():
+    """Reminders live in MongoDB only; other storage backends do not serve them"""
+    if database.database is None:
+        raise HTTPException(status_code=503, detail="Reminders require the MongoDB storage backend")
+    return database.database
+
+
+def serialize_reminder(document: dict) -> dict:
+    if not document:
+        return document
+    data = {**document}
+    for key in ("_id", "user_id", "application_id", "template_id"):
+        if data.get(key) is not None:
+            data[key] = str(data[key])
+    return data
+
+
+@router.get("/")
+async def list_reminders(
+    status: str = "open",
+    limit: int = 100,
+    current_user: dict = Depends(get_current_user),
+    db=Depends(get_database),
+):
+    """List follow-up reminders for the current user, most recently due first"""
+    try:
+        cursor = db.reminders.find({
+            "user_id": ObjectId(current_user["user_id"]),
+            "status": status,
+        }).sort("due_at", -1).limit(limit)
+        return [serialize_reminder(doc) async for doc in cursor]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{reminder_id}/dismiss")
+async def dismiss_reminder(
+    reminder_id: str,
+    current_user: dict = Depends(get_current_user),
+    db=Depends(get_database),
+):
+    if not ObjectId.is_valid(reminder_id):
+        raise HTTPException(status_code=400, detail="Invalid reminder ID")
+    result = await db.reminders.update_one(
+        {"_id": ObjectId(reminder_id), "user_id": ObjectId(current_user["user_id"])},
+        {"$set": {"status": "dismissed", "dismissed_at": datetime.utcnow()}},
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    return {"message": "Reminder dismissed"}
+
+
+@router.put("/settings")
+async def update_reminder_settings(
+    payload: ReminderSettingsUpdate,
+    current_user: dict = Depends(get_current_user),
+    db=Depends(get_database),
+):
+    """Choose the email template rendered into new reminders"""
+    user_id = ObjectId(current_user["user_id"])
+    template_id = None
+    if payload.template_id is not None:
+        if not ObjectId.is_valid(payload.template_id):
+            raise HTTPException(status_code=400, detail="Invalid template ID")
+        template_id = ObjectId(payload.template_id)
+        template = await db.templates.find_one({"_id": template_id, "user_id": user_id}, {"_id": 1})
+        if not template:
+            raise HTTPException(status_code=404, detail="Template not found")
+
+    await db.users.update_one({"_id": user_id}, {"$set": {"reminder_template_id": template_id}})
+    return {"template_id": str(template_id) if template_id else None}
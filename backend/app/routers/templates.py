@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 
-from ..database import get_database
-from ..models import EmailTemplateCreate
+from ..repositories import Repositories, get_repositories
+from ..models import EmailTemplateCreate, EmailTemplateUpdate
 from ..auth import get_current_user
+from ..ratelimit import limit_user
 
-router = APIRouter(prefix="/templates", tags=["templates"])
+router = APIRouter(
+    prefix="/templates",
+    tags=["templates"],
+    dependencies=[Depends(limit_user("api"))],
+)
 
 
 def serialize_template(document: dict) -> dict:
@@ -25,7 +30,7 @@ def serialize_template(document: dict) -> dict:
 async def create_template(
     payload: EmailTemplateCreate,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database),
+    repos: Repositories = Depends(get_repositories),
 ):
     try:
         now = datetime.utcnow()
@@ -37,8 +42,7 @@ async def create_template(
             "created_at": now,
             "updated_at": now,
         }
-        result = await db.templates.insert_one(doc)
-        doc["_id"] = result.inserted_id
+        doc = await repos.templates.create(doc)
         return serialize_template(doc)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -47,12 +51,10 @@ async def create_template(
 @router.get("/")
 async def list_templates(
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database),
+    repos: Repositories = Depends(get_repositories),
 ):
     try:
-        cursor = db.templates.find({"user_id": ObjectId(current_user["user_id"])}) \
-            .sort("created_at", -1)
-        items = [serialize_template(doc) async for doc in cursor]
+        items = [serialize_template(doc) for doc in await repos.templates.list(current_user["user_id"])]
         return items
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -62,14 +64,11 @@ async def list_templates(
 async def get_template(
     template_id: str,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database),
+    repos: Repositories = Depends(get_repositories),
 ):
     if not ObjectId.is_valid(template_id):
         raise HTTPException(status_code=400, detail="Invalid template ID")
-    doc = await db.templates.find_one({
-        "_id": ObjectId(template_id),
-        "user_id": ObjectId(current_user["user_id"]),
-    })
+    doc = await repos.templates.get(current_user["user_id"], template_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Template not found")
     return serialize_template(doc)
@@ -78,25 +77,18 @@ async def get_template(
 @router.put("/{template_id}")
 async def update_template(
     template_id: str,
-    payload: dict = Body(...),
+    payload: EmailTemplateUpdate,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database),
+    repos: Repositories = Depends(get_repositories),
 ):
     if not ObjectId.is_valid(template_id):
         raise HTTPException(status_code=400, detail="Invalid template ID")
-    update_data = {k: v for k, v in payload.items() if v is not None}
+    update_data = payload.model_dump(exclude_none=True)
     update_data["updated_at"] = datetime.utcnow()
 
-    result = await db.templates.update_one(
-        {"_id": ObjectId(template_id), "user_id": ObjectId(current_user["user_id"])},
-        {"$set": update_data},
-    )
-    if result.matched_count == 0:
+    doc = await repos.templates.update(current_user["user_id"], template_id, update_data)
+    if not doc:
         raise HTTPException(status_code=404, detail="Template not found")
-    doc = await db.templates.find_one({
-        "_id": ObjectId(template_id),
-        "user_id": ObjectId(current_user["user_id"]),
-    })
     return serialize_template(doc)
 
 
@@ -104,15 +96,12 @@ async def update_template(
 async def delete_template(
     template_id: str,
     current_user: dict = Depends(get_current_user),
-    db=Depends(get_database),
+    repos: Repositories = Depends(get_repositories),
 ):
     if not ObjectId.is_valid(template_id):
         raise HTTPException(status_code=400, detail="Invalid template ID")
-    result = await db.templates.delete_one({
-        "_id": ObjectId(template_id),
-        "user_id": ObjectId(current_user["user_id"]),
-    })
-    if result.deleted_count == 0:
+    deleted = await repos.templates.delete(current_user["user_id"], template_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Template not found")
     return {"message": "Template deleted"}
 
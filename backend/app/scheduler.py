@@ -0,0 +1,188 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from .database import database
+from .settings import get_settings
+
+# Identifies this process as a lease holder; unique across hosts, workers and restarts
+OWNER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class Lease:
+    """
+    Time-limited exclusive claim on a named job, stored in ``scheduler_leases``
+
+    Only the worker holding the lease runs the job, so several workers can
+    schedule the same job without it firing twice. A holder that dies simply
+    stops renewing and another worker takes over once ``expires_at`` passes.
+    """
+
+    def __init__(self, db, name: str, ttl_seconds: int):
+        self.collection = db.scheduler_leases
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+
+    async def acquire(self) -> bool:
+        """Take the lease if it is free or expired, or extend it if we already hold it"""
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {"_id": self.name, "$or": [{"owner": OWNER_ID}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": OWNER_ID, "expires_at": now + self.ttl, "renewed_at": now}},
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            # Filter did not match and the upsert collided: someone else holds it
+            return False
+
+    async def renew(self) -> bool:
+        """Extend a held lease; False means it was lost and the caller must stop"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": self.name, "owner": OWNER_ID},
+            {"$set": {"expires_at": now + self.ttl, "renewed_at": now}},
+        )
+        return result.matched_count == 1
+
+    async def hold(self, seconds: float):
+        """Keep a held lease for ``seconds`` from now"""
+        await self.collection.update_one(
+            {"_id": self.name, "owner": OWNER_ID},
+            {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=seconds)}},
+        )
+
+    async def release(self, until: Optional[datetime] = None):
+        """Give up a held lease at ``until`` (the job's next due time), or now"""
+        await self.collection.update_one(
+            {"_id": self.name, "owner": OWNER_ID},
+            {"$set": {"expires_at": max(until or datetime.min, datetime.utcnow())}},
+        )
+
+class LeaseLost(Exception):
+    """Raised by a job when its lease was taken over mid-run"""
+
+JobFn = Callable[[object, Lease], Awaitable[None]]
+SetupFn = Callable[[object], Awaitable[None]]
+
+# How often setup that does not belong to a job (index creation) is retried
+SETUP_RETRY_SECONDS = 30
+
+async def run_periodically(name: str, interval_seconds: float, job: JobFn, setup: Optional[SetupFn] = None):
+    """
+    Run ``job(db, lease)`` every ``interval_seconds`` on whichever worker holds the lease
+
+    ``setup(db)`` (index creation) runs before the first job and is retried on
+    every tick until it succeeds, so an unreachable database never holds up startup.
+    """
+    settings = get_settings()
+    lease = None
+    # When the job is next due after a completed run; None while it has not run or is running
+    next_run = None
+    try:
+        while True:
+            db = database.database
+            if db is not None:
+                lease = Lease(db, name, settings.scheduler_lease_seconds)
+                try:
+                    if setup is not None:
+                        await setup(db)
+                        setup = None
+                    if await lease.acquire():
+                        next_run = None
+                        await job(db, lease)
+                        next_run = datetime.utcnow() + timedelta(seconds=interval_seconds)
+                        # Keep the job on this worker until its next run so others do not
+                        # fire it again in between; if we die it frees up one interval later
+                        await lease.hold(interval_seconds + settings.scheduler_lease_seconds)
+                except LeaseLost:
+                    print(f"Scheduler: lost lease for {name}, stopping this run")
+                except Exception as e:
+                    print(f"Warning: scheduled job {name} failed: {e}")
+            await asyncio.sleep(interval_seconds)
+    except asyncio.CancelledError:
+        # On shutdown hand the job over when it is next due, so a restart or deploy
+        # does not fire it early; a run cut short is handed over straight away
+        if lease is not None:
+            try:
+                await asyncio.shield(lease.release(next_run))
+            except Exception:
+                pass
+        raise
+
+async def run_locally(name: str, interval_seconds: float, job: Callable[[], Awaitable[None]]):
+    """
+    Run ``job()`` every ``interval_seconds`` in this process
+
+    For the SQLite backend, which has no shared store to hold leases; its
+    jobs must be safe to run in several workers at once.
+    """
+    while True:
+        try:
+            await job()
+        except Exception as e:
+            print(f"Warning: scheduled job {name} failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+async def run_setup(name: str, setup: SetupFn, retry_seconds: Optional[float] = None):
+    """Run ``setup(db)`` once, retrying every ``retry_seconds`` (SETUP_RETRY_SECONDS) until it succeeds"""
+    retry_seconds = retry_seconds or SETUP_RETRY_SECONDS
+    while True:
+        db = database.database
+        if db is not None:
+            try:
+                await setup(db)
+                return
+            except Exception as e:
+                print(f"Warning: setup {name} failed, retrying in {retry_seconds:g}s: {e}")
+        await asyncio.sleep(retry_seconds)
+
+_tasks: List[asyncio.Task] = []
+
+def schedule(name: str, interval_seconds: float, job: JobFn, setup: Optional[SetupFn] = None):
+    """Start a periodic job on the running event loop"""
+    _tasks.append(asyncio.create_task(run_periodically(name, interval_seconds, job, setup), name=f"job:{name}"))
+
+async def start_background_jobs():
+    """Start every enabled background job; called from lifespan"""
+    from . import archive, purge, reminders
+    from .repositories import get_repositories
+
+    settings = get_settings()
+    repos = await get_repositories()
+    if settings.storage_backend == "sqlite":
+        if settings.purge_enabled:
+            _tasks.append(asyncio.create_task(
+                run_locally("purge", settings.purge_interval_seconds, lambda: purge.purge_local(repos)),
+                name="job:purge",
+            ))
+        return
+    if database.database is None:
+        return
+    # The repositories' own indexes (photo hash, events, weekly summaries); like the
+    # jobs' setup this waits out an unreachable database instead of being skipped
+    _tasks.append(asyncio.create_task(
+        run_setup("repository_indexes", lambda db: repos.ensure_indexes()), name="setup:repository_indexes"
+    ))
+    if settings.reminders_enabled:
+        schedule("reminders", settings.reminder_scan_interval_seconds, reminders.scan_due_applications,
+                 setup=reminders.ensure_indexes)
+    if settings.purge_enabled:
+        schedule("purge", settings.purge_interval_seconds, purge.purge_deleted_applications,
+                 setup=purge.ensure_indexes)
+        schedule("orphan_sweep", settings.orphan_sweep_interval_seconds, purge.sweep_orphaned_images)
+    if settings.archive_enabled:
+        schedule("archive", settings.archive_interval_seconds, archive.archive_applications,
+                 setup=archive.ensure_indexes)
+
+async def stop_background_jobs():
+    """Cancel background jobs and wait for them to unwind"""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
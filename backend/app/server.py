@@ -0,0 +1,31 @@
+import os
+
+from uvicorn_worker import UvicornWorker as _UvicornWorker
+
+def available_cpus() -> int:
+    """CPUs this process may run on, honouring container affinity limits"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def worker_count(configured: int = 0) -> int:
+    """Number of worker processes; 0 means one per available CPU"""
+    return configured if configured > 0 else available_cpus()
+
+class UvicornWorker(_UvicornWorker):
+    """
+    Gunicorn worker running the app on uvloop and httptools
+
+    Gunicorn owns process management (SIGTERM drain, max-requests recycling)
+    while each worker runs its own event loop. Lifespan is forced on so every
+    worker opens and closes its own Mongo client; Motor clients must never be
+    shared across a fork.
+    """
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+        "proxy_headers": True,
+        "server_header": False,
+    }
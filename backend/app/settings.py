@@ -0,0 +1,129 @@
+import os
+from functools import lru_cache
+from typing import Optional
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name) or default)
+
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name) or default)
+
+
+class Settings:
+    """Application configuration read from the environment (and .env)"""
+
+    def __init__(self):
+        # Imported here so that importing this module stays free
+        from dotenv import load_dotenv
+
+        load_dotenv()
+
+        # Storage backend: "mongo", or "sqlite" for a single-host install without a database server
+        self.storage_backend = (os.getenv("STORAGE_BACKEND") or "mongo").lower()
+        self.sqlite_path = os.getenv("SQLITE_PATH") or "job_tracker.db"
+        self.sqlite_readers = _int("SQLITE_READERS", 4)
+
+        # MongoDB
+        self.mongodb_url: Optional[str] = os.getenv("MONGODB_URL")
+        self.database_name: Optional[str] = os.getenv("DATABASE_NAME")
+        self.mongodb_max_pool_size = _int("MONGODB_MAX_POOL_SIZE", 50)
+        self.mongodb_min_pool_size = _int("MONGODB_MIN_POOL_SIZE", 5)
+        self.mongodb_max_idle_time_ms = _int("MONGODB_MAX_IDLE_TIME_MS", 300000)
+        self.mongodb_wait_queue_timeout_ms = _int("MONGODB_WAIT_QUEUE_TIMEOUT_MS", 5000)
+        self.mongodb_server_selection_timeout_ms = _int("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 5000)
+        self.mongodb_connect_timeout_ms = _int("MONGODB_CONNECT_TIMEOUT_MS", 5000)
+        # Client-side operation timeout; pymongo derives maxTimeMS for each operation from it
+        self.mongodb_timeout_ms = _int("MONGODB_TIMEOUT_MS", 10000)
+        # Compressors the driver may negotiate, in order of preference
+        self.mongodb_compressors = os.getenv("MONGODB_COMPRESSORS") or "zstd,snappy,zlib"
+
+        # Readiness probe
+        self.readiness_cache_seconds = _float("READINESS_CACHE_SECONDS", 2)
+        self.readiness_ping_timeout_seconds = _float("READINESS_PING_TIMEOUT_SECONDS", 1)
+
+        # Cloudinary
+        self.cloudinary_url: Optional[str] = os.getenv("CLOUDINARY_URL")
+        self.cloudinary_cloud_name: Optional[str] = os.getenv("CLOUDINARY_CLOUD_NAME")
+        self.cloudinary_api_key: Optional[str] = os.getenv("CLOUDINARY_API_KEY")
+        self.cloudinary_api_secret: Optional[str] = os.getenv("CLOUDINARY_API_SECRET")
+
+        # Photo uploads: size cap enforced while streaming, and how much of each is held in memory before spilling to disk
+        self.upload_max_bytes = _int("UPLOAD_MAX_BYTES", 5 * 1024 * 1024)
+        self.upload_spool_bytes = _int("UPLOAD_SPOOL_BYTES", 256 * 1024)
+
+        # Authentication
+        self.secret_key: Optional[str] = os.getenv("SECRET_KEY")
+        self.access_token_expire_minutes = _int("ACCESS_TOKEN_EXPIRE_MINUTES", 20160)
+        self.github_client_id: Optional[str] = os.getenv("GITHUB_CLIENT_ID")
+        self.github_client_secret: Optional[str] = os.getenv("GITHUB_CLIENT_SECRET")
+        self.github_redirect_uri: Optional[str] = os.getenv("GITHUB_REDIRECT_URI")
+
+        self.frontend_url: Optional[str] = os.getenv("FRONTEND_URL")
+
+        # Request deadlines: a default for every request plus per-route overrides as
+        # comma-separated "METHOD /path/prefix=seconds" entries (longest prefix wins)
+        self.request_timeout_seconds = _float("REQUEST_TIMEOUT_SECONDS", 10)
+        self.route_timeouts = os.getenv("ROUTE_TIMEOUTS") or (
+            "POST /api/applications/=30,PUT /api/applications/=30,GET /api/auth/github/callback=15"
+        )
+        # Caps for outbound calls made outside any request (background jobs)
+        self.http_timeout_seconds = _float("HTTP_TIMEOUT_SECONDS", 10)
+        self.cloudinary_timeout_seconds = _float("CLOUDINARY_TIMEOUT_SECONDS", 30)
+
+        # Rate limiting ("memory" per worker, or "mongo" shared by all workers)
+        self.rate_limit_backend = os.getenv("RATE_LIMIT_BACKEND") or "memory"
+        self.rate_limit_user_per_minute = _float("RATE_LIMIT_USER_PER_MINUTE", 120)
+        self.rate_limit_user_burst = _float("RATE_LIMIT_USER_BURST", 60)
+        self.rate_limit_write_per_minute = _float("RATE_LIMIT_WRITE_PER_MINUTE", 20)
+        self.rate_limit_write_burst = _float("RATE_LIMIT_WRITE_BURST", 10)
+        # Batch creates are charged per application; the burst caps the largest batch accepted
+        self.rate_limit_batch_per_minute = _float("RATE_LIMIT_BATCH_PER_MINUTE", 200)
+        self.rate_limit_batch_burst = _float("RATE_LIMIT_BATCH_BURST", 100)
+        self.rate_limit_auth_ip_per_minute = _float("RATE_LIMIT_AUTH_IP_PER_MINUTE", 10)
+        self.rate_limit_auth_ip_burst = _float("RATE_LIMIT_AUTH_IP_BURST", 5)
+        # Concurrent photo uploads per worker before requests queue, then get shed
+        self.upload_concurrency = _int("UPLOAD_CONCURRENCY", 8)
+        self.upload_queue_timeout_seconds = _float("UPLOAD_QUEUE_TIMEOUT_SECONDS", 2)
+        self.upload_max_queue = _int("UPLOAD_MAX_QUEUE", 32)
+
+        # Background jobs
+        self.scheduler_lease_seconds = _int("SCHEDULER_LEASE_SECONDS", 120)
+        self.reminders_enabled = (os.getenv("REMINDERS_ENABLED") or "true").lower() == "true"
+        self.reminder_followup_days = _int("REMINDER_FOLLOWUP_DAYS", 14)
+        self.reminder_scan_interval_seconds = _float("REMINDER_SCAN_INTERVAL_SECONDS", 300)
+        self.reminder_batch_size = _int("REMINDER_BATCH_SIZE", 500)
+        self.purge_enabled = (os.getenv("PURGE_ENABLED") or "true").lower() == "true"
+        # Deleted applications stay restorable for this long before being hard-deleted
+        self.purge_grace_days = _int("PURGE_GRACE_DAYS", 7)
+        self.purge_interval_seconds = _float("PURGE_INTERVAL_SECONDS", 600)
+        self.purge_batch_size = _int("PURGE_BATCH_SIZE", 200)
+        self.purge_max_attempts = _int("PURGE_MAX_ATTEMPTS", 10)
+        self.orphan_sweep_interval_seconds = _float("ORPHAN_SWEEP_INTERVAL_SECONDS", 86400)
+        self.orphan_min_age_hours = _float("ORPHAN_MIN_AGE_HOURS", 24)
+        self.archive_enabled = (os.getenv("ARCHIVE_ENABLED") or "true").lower() == "true"
+        # Rejected / Not Hiring applications older than this move to the archive collection
+        self.archive_after_days = _int("ARCHIVE_AFTER_DAYS", 180)
+        self.archive_interval_seconds = _float("ARCHIVE_INTERVAL_SECONDS", 21600)
+        self.archive_batch_size = _int("ARCHIVE_BATCH_SIZE", 500)
+
+        # Production server (gunicorn.conf.py)
+        self.host = os.getenv("HOST") or "0.0.0.0"
+        self.port = _int("PORT", 8000)
+        # 0 means one worker per available CPU
+        self.web_concurrency = _int("WEB_CONCURRENCY", 0)
+        self.max_requests = _int("MAX_REQUESTS", 10000)
+        self.max_requests_jitter = _int("MAX_REQUESTS_JITTER", 1000)
+        self.graceful_timeout = _int("GRACEFUL_TIMEOUT", 30)
+        self.worker_timeout = _int("WORKER_TIMEOUT", 60)
+        self.keepalive = _int("KEEPALIVE", 5)
+        # Proxies whose X-Forwarded-For / X-Forwarded-Proto are trusted (comma-separated, or "*");
+        # behind a load balancer on another host, list its address so per-IP limits see real clients
+        self.forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS") or "127.0.0.1"
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Load settings on first use and reuse them afterwards"""
+    return Settings()
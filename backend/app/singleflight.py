@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from .deadlines import detached_context
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent reads into a single database call
+
+    Calls are keyed by ``(user_id, route, normalized params)``. While a call for a
+    key is in flight, later callers await the same task instead of issuing their
+    own query. The call runs as its own task, so the first caller disconnecting
+    does not cancel it for the others, and outside the first caller's deadline,
+    so callers that joined later are not timed out by it.
+
+    Writes must call ``invalidate(user_id)`` once they have been acknowledged.
+    That detaches the user's in-flight calls, so any read arriving afterwards
+    starts a fresh call rather than joining one that may have read pre-write data.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    @staticmethod
+    def make_key(user_id: str, route: str, **params) -> tuple:
+        """Build a call key; parameter order and ``None`` values do not matter"""
+        normalized = tuple(sorted((k, v) for k, v in params.items() if v is not None))
+        return (str(user_id), route, normalized)
+
+    async def do(self, key: tuple, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` once for all concurrent callers of ``key`` and return its result"""
+        task = self._calls.get(key)
+        if task is None:
+            task = detached_context().run(asyncio.ensure_future, fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        return await asyncio.shield(task)
+
+    async def do_json(self, key: tuple, fn: Callable[[], Awaitable[Any]]) -> Response:
+        """Like ``do`` but also shares the rendered JSON body between callers"""
+        async def render():
+            return JSONResponse(jsonable_encoder(await fn())).body
+
+        body = await self.do(key + ("json",), render)
+        return Response(content=body, media_type="application/json")
+
+    def invalidate(self, user_id: str):
+        """Stop sharing in-flight reads for a user; call after each write for that user"""
+        user_id = str(user_id)
+        for key in [k for k in self._calls if k[0] == user_id]:
+            # Callers already waiting keep their task; new callers will not find it
+            del self._calls[key]
+
+    def _forget(self, key, task: asyncio.Task):
+        # A newer call may have replaced this one after an invalidation
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when nobody is left awaiting it
+            task.exception()
+
+# Per-process coalescing of user-scoped reads
+reads = SingleFlight()
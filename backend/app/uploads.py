@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from .settings import get_settings
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+# Room for boundaries, part headers and any small parts sent along with the photo
+FORM_OVERHEAD_BYTES = 64 * 1024
+# Enough leading bytes for every signature sniff_image_type knows
+SNIFF_BYTES = 12
+# JSON bodies carry text only; a full batch create fits comfortably
+MAX_JSON_BYTES = 256 * 1024
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Content type of an image from its leading magic bytes, or None if it is not one we accept"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp":
+        brand = head[8:12]
+        if brand in (b"avif", b"avis"):
+            return "image/avif"
+        if brand in (b"heic", b"heix", b"mif1", b"msf1"):
+            return "image/heic"
+    return None
+
+class ImageUpload:
+    """
+    An uploaded image spooled to a temporary file while it streams in
+
+    At most UPLOAD_SPOOL_BYTES is held in memory; larger images spill to
+    disk. The SHA-256 of the content is computed on the way through.
+    """
+
+    def __init__(self, filename: str, spool_bytes: int):
+        self.filename = filename
+        self.file = SpooledTemporaryFile(max_size=spool_bytes)
+        self.content_type: Optional[str] = None
+        self.size = 0
+        self._head = b""
+        self._hash = hashlib.sha256()
+
+    @property
+    def in_memory(self) -> bool:
+        return not getattr(self.file, "_rolled", True)
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    async def write(self, data: bytes, max_bytes: int):
+        self.size += len(data)
+        if self.size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Photo exceeds the {max_bytes} byte limit")
+        if self.content_type is None:
+            self._head += data[:SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= SNIFF_BYTES:
+                self._check_type()
+        self._hash.update(data)
+        if self.in_memory:
+            self.file.write(data)
+        else:
+            await asyncio.to_thread(self.file.write, data)
+
+    def finish(self):
+        if self.content_type is None:
+            self._check_type()
+        self.file.seek(0)
+
+    def _check_type(self):
+        self.content_type = sniff_image_type(self._head)
+        if self.content_type is None:
+            raise HTTPException(status_code=415, detail="Photo must be a JPEG, PNG, GIF, WebP, AVIF or HEIC image")
+
+    def close(self):
+        self.file.close()
+
+async def read_photo_upload(request: Request, file_field: str = "photo") -> Optional[ImageUpload]:
+    """
+    Stream a multipart body, returning the image in ``file_field`` (None when there is none)
+
+    The body is parsed chunk by chunk as it arrives rather than spooled up
+    front, so a request is rejected as soon as it gives itself away: 413 when
+    Content-Length or the bytes read so far exceed the limit, and 415 as soon
+    as the first bytes of the file are not an image, or when the body is not
+    multipart at all. The rest of the body is never read. Other parts are
+    skipped.
+    """
+    settings = get_settings()
+    max_bytes = settings.upload_max_bytes
+
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data body")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Photo exceeds the {max_bytes} byte limit")
+
+    # The parser only records events; they are applied between chunks so writes can await
+    events = []
+    headers: Dict[bytes, bytes] = {}
+    header_field = bytearray()
+    header_value = bytearray()
+
+    def on_header_field(data, start, end):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data, start, end):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    callbacks = {
+        "on_part_begin": lambda: headers.clear(),
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": lambda: events.append(("begin", dict(headers))),
+        "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+        "on_part_end": lambda: events.append(("end", None)),
+    }
+    parser = MultipartParser(boundary, callbacks, max_size=max_bytes + FORM_OVERHEAD_BYTES)
+
+    image: Optional[ImageUpload] = None
+    target: Optional[ImageUpload] = None
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes + FORM_OVERHEAD_BYTES:
+                raise HTTPException(status_code=413, detail=f"Photo exceeds the {max_bytes} byte limit")
+            parser.write(chunk)
+            for kind, payload in events:
+                if kind == "begin":
+                    _, disposition = parse_options_header(payload.get(b"content-disposition", b""))
+                    name = disposition.get(b"name", b"").decode("utf-8", "replace")
+                    filename = disposition.get(b"filename")
+                    target = None
+                    # Browsers send an empty, nameless file part when no photo was picked;
+                    # that and any other part are skipped
+                    if name == file_field and filename and image is None:
+                        image = target = ImageUpload(filename.decode("utf-8", "replace"), settings.upload_spool_bytes)
+                elif kind == "data":
+                    if target is not None:
+                        await target.write(payload, max_bytes)
+                elif kind == "end":
+                    if target is not None:
+                        target.finish()
+                    target = None
+            events.clear()
+        parser.finalize()
+    except Exception as e:
+        if image is not None:
+            image.close()
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=400, detail="Malformed multipart body")
+    return image
+
+async def read_body(request: Request, max_bytes: int, detail: str = "Request body is too large") -> bytes:
+    """The whole body of a request expected to be small, refusing it with 413 past ``max_bytes``"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(status_code=413, detail=detail)
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise HTTPException(status_code=413, detail=detail)
+    return bytes(body)
+
+async def store_photo(repos, user_id: str, image: ImageUpload) -> Dict[str, str]:
+    """
+    Photo fields for an application, uploading the image only if it is new
+
+    A photo the user already has on a live application (same SHA-256) is
+    reused instead of being uploaded again.
+    """
+    from .cloudinary_config import upload_image
+
+    existing = await repos.applications.find_by_photo_hash(user_id, image.sha256)
+    if existing and existing.get("photo_public_id"):
+        return {
+            "photo_public_id": existing["photo_public_id"],
+            "photo_url": existing.get("photo_url"),
+            "photo_sha256": image.sha256,
+        }
+    # The SDK is blocking; keep it off the event loop
+    upload_result = await asyncio.to_thread(upload_image, image.file)
+    return {
+        "photo_public_id": upload_result["public_id"],
+        "photo_url": upload_result["secure_url"],
+        "photo_sha256": image.sha256,
+    }
@@ -0,0 +1,148 @@
+"""
+Cold-start benchmark for the backend process.
+
+Measures two things in fresh interpreters, the way a scale-to-zero host sees them:
+
+  * import cost of ``main`` as reported by ``python -X importtime``
+  * time to first response: spawn uvicorn and poll ``/health`` until it answers
+
+Each run is repeated and the median is compared against a budget, so the script
+doubles as a CI gate (non-zero exit when a budget is exceeded).
+
+Usage (from the backend directory):
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 7 --import-budget-ms 400 --first-response-budget-ms 1500
+    python benchmarks/startup.py --skip-server --top 15
+
+Time to first response includes the lifespan startup. The server runs with
+STORAGE_BACKEND=sqlite on a throwaway database so no database server is needed;
+``--storage mongo`` measures against MONGODB_URL instead (an unreachable server
+adds the warm-up ping's selection timeout).
+
+tests/test_startup.py asserts the import-side budget as part of the test suite.
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_imports(module: str = "main"):
+    """Import ``module`` in a fresh interpreter and return (total_ms, [(cumulative_us, name), ...])"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_us, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        entries.append((cumulative_us, name))
+        # Interpreter startup (site, encodings) is not ours; only count the requested module
+        if len(indent) == 1 and name == module:
+            total_us = cumulative_us
+    return total_us / 1000, entries
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(storage: str = "sqlite", timeout: float = 30.0) -> float:
+    """Spawn uvicorn and return milliseconds until ``/health`` first answers 200"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    env = dict(os.environ, STORAGE_BACKEND=storage)
+    env.setdefault("SECRET_KEY", "startup-benchmark")
+    workdir = tempfile.TemporaryDirectory()
+    if storage == "sqlite":
+        env["SQLITE_PATH"] = os.path.join(workdir.name, "startup.db")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=0.5) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError(f"/health did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+        workdir.cleanup()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=800.0)
+    parser.add_argument("--first-response-budget-ms", type=float, default=2500.0)
+    parser.add_argument("--top", type=int, default=10, help="show the N most expensive imports")
+    parser.add_argument("--skip-server", action="store_true", help="only measure import time")
+    parser.add_argument("--storage", choices=["sqlite", "mongo"], default="sqlite",
+                        help="storage backend for the first-response run")
+    args = parser.parse_args()
+
+    failures = []
+
+    import_samples = []
+    slowest = []
+    for _ in range(args.runs):
+        total_ms, entries = measure_imports()
+        import_samples.append(total_ms)
+        slowest = entries
+    import_ms = statistics.median(import_samples)
+    print(f"import main: median {import_ms:.1f} ms over {args.runs} runs (budget {args.import_budget_ms:.0f} ms)")
+    for cumulative_us, name in sorted(slowest, reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import time {import_ms:.1f} ms exceeds budget {args.import_budget_ms:.0f} ms")
+
+    if not args.skip_server:
+        response_samples = [measure_first_response(args.storage) for _ in range(args.runs)]
+        first_response_ms = statistics.median(response_samples)
+        print(
+            f"first response: median {first_response_ms:.1f} ms over {args.runs} runs "
+            f"(budget {args.first_response_budget_ms:.0f} ms)"
+        )
+        if first_response_ms > args.first_response_budget_ms:
+            failures.append(
+                f"time to first response {first_response_ms:.1f} ms exceeds budget "
+                f"{args.first_response_budget_ms:.0f} ms"
+            )
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Throughput scaling benchmark for the production server profile.
+
+Starts ``gunicorn -c gunicorn.conf.py main:app`` with 1, 2, ... N workers and
+drives it with load-generator processes, reporting requests/second and latency
+percentiles per worker count so the scaling curve is visible:
+
+    python benchmarks/throughput.py
+    python benchmarks/throughput.py --max-workers 8 --duration 15 --path /api/applications/ \\
+        --header "Authorization: Bearer <token>"
+
+The load generators share the machine with the server, so leave cores free for
+them (``--load-processes``) or the curve flattens early. Only successful (2xx/3xx)
+responses count towards req/s and latency; 4xx/5xx and connection errors are
+reported separately, so a run that mostly hits the per-user rate limiter shows
+up as errors rather than as throughput. Raise RATE_LIMIT_USER_PER_MINUTE and
+RATE_LIMIT_USER_BURST for the server when benchmarking authenticated paths.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _drive(url: str, headers: dict, concurrency: int, duration: float):
+    import httpx
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=10) as client:
+        async def loop():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                if response.status_code >= 400:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _load_process(url, headers, concurrency, duration, results):
+    results.put(asyncio.run(_drive(url, headers, concurrency, duration)))
+
+
+def run_load(url: str, headers: dict, processes: int, concurrency: int, duration: float):
+    """Run ``processes`` load generators with ``concurrency`` connections each"""
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_load_process, args=(url, headers, concurrency, duration, results))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    latencies, errors = [], 0
+    for _ in workers:
+        worker_latencies, worker_errors = results.get()
+        latencies.extend(worker_latencies)
+        errors += worker_errors
+    for worker in workers:
+        worker.join()
+    return latencies, errors
+
+
+# Logged by each worker once its lifespan startup has finished
+STARTUP_COMPLETE = "Application startup complete"
+
+
+def _wait_until_up(url: str, process: subprocess.Popen, error_log: str, workers: int, timeout: float = 60.0):
+    """Wait until every worker has finished startup and the server answers ``url``"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        with open(error_log, errors="replace") as log:
+            ready = log.read().count(STARTUP_COMPLETE)
+        if ready >= workers:
+            try:
+                with urllib.request.urlopen(url, timeout=0.5):
+                    return
+            except OSError:
+                pass
+        time.sleep(0.05)
+    raise RuntimeError(f"{workers} workers did not all come up within {timeout}s")
+
+
+def start_server(workers: int, port: int, error_log: str) -> subprocess.Popen:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "HOST": "127.0.0.1", "PORT": str(port)}
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+            "--access-logfile", "/dev/null", "--error-logfile", error_log, "--log-level", "info",
+            "main:app",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per worker count")
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--header", action="append", default=[], help="extra request header, 'Name: value'")
+    parser.add_argument("--load-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--concurrency", type=int, default=32, help="connections per load process")
+    args = parser.parse_args()
+
+    headers = dict(h.split(":", 1) for h in args.header)
+    headers = {k.strip(): v.strip() for k, v in headers.items()}
+
+    print(f"{'workers':>7} {'req/s':>10} {'scaling':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        port = _free_port()
+        with tempfile.NamedTemporaryFile(suffix=".log") as error_log:
+            server = start_server(workers, port, error_log.name)
+            try:
+                _wait_until_up(f"http://127.0.0.1:{port}/health", server, error_log.name, workers)
+                latencies, errors = run_load(
+                    f"http://127.0.0.1:{port}{args.path}", headers, args.load_processes, args.concurrency, args.duration
+                )
+            finally:
+                # SIGTERM exercises the same graceful drain path as a deploy
+                server.terminate()
+                server.wait()
+
+        # Only successful responses count as served
+        throughput = len(latencies) / args.duration
+        if not latencies:
+            print(f"{workers:>7} {0:>10} {'-':>8} {'-':>8} {'-':>8} {errors:>7}")
+            continue
+        baseline = baseline or throughput
+        print(
+            f"{workers:>7} {throughput:>10.0f} {throughput / baseline:>7.2f}x "
+            f"{statistics.median(latencies) * 1000:>8.1f} {_percentile(latencies, 0.99) * 1000:>8.1f} {errors:>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
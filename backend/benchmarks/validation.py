@@ -0,0 +1,111 @@
+"""
+Request validation benchmark for the application endpoints.
+
+Times what each create/update request pays to turn its body into a validated
+payload, per request and per batch item:
+
+  * the precompiled adapters in ``app.models`` validating raw JSON bytes
+    (what the routes do)
+  * ``json.loads`` followed by ``model_validate`` (the usual two-step path)
+  * building a fresh ``TypeAdapter`` per request (what precompiling avoids)
+  * the old hand-rolled form handling: ``fromisoformat`` plus a status set
+
+Usage (from the backend directory):
+
+    python benchmarks/validation.py
+    python benchmarks/validation.py --number 20000 --batch-size 100 --budget-us 30
+
+With ``--budget-us`` the script exits non-zero when precompiled validation of a
+single create body takes longer than the budget, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.models import (  # noqa: E402
+    JobApplicationCreate,
+    application_batch_adapter,
+    application_create_adapter,
+    application_update_adapter,
+)
+
+CREATE_BODY = {
+    "company_name": "Google",
+    "link": "https://careers.google.com/jobs/results/123456",
+    "link_type": "job portal",
+    "date_of_applying": "2024-01-15T10:30:00Z",
+    "status": "Pending",
+    "notes": "Applied for Software Engineer position",
+}
+UPDATE_BODY = {"status": "Followed up", "notes": "Pinged the recruiter"}
+STATUSES = {"Pending", "Not Hiring", "Rejected", "Accepted", "Followed up"}
+
+
+def _form_path(form: dict) -> dict:
+    """The per-field handling the form endpoints used to do"""
+    status = form.get("status", "Pending")
+    if status not in STATUSES:
+        status = "Pending"
+    return {
+        "company_name": form["company_name"],
+        "link": form.get("link"),
+        "link_type": form.get("link_type"),
+        "date_of_applying": datetime.fromisoformat(form["date_of_applying"].replace("Z", "+00:00")),
+        "status": status,
+        "notes": form.get("notes"),
+    }
+
+
+def _time_us(fn, number: int, repeat: int) -> float:
+    """Best-of-``repeat`` microseconds per call"""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs; the best is reported")
+    parser.add_argument("--batch-size", type=int, default=100, help="applications per batch body")
+    parser.add_argument("--budget-us", type=float, default=None, help="fail above this many us per create body")
+    args = parser.parse_args()
+
+    create_json = json.dumps(CREATE_BODY).encode()
+    update_json = json.dumps(UPDATE_BODY).encode()
+    batch_json = json.dumps([CREATE_BODY] * args.batch_size).encode()
+    batch_number = max(1, args.number // args.batch_size)
+
+    rows = [
+        ("create: precompiled validate_json", lambda: application_create_adapter.validate_json(create_json), args.number),
+        ("create: json.loads + model_validate",
+         lambda: JobApplicationCreate.model_validate(json.loads(create_json)), args.number),
+        ("create: TypeAdapter built per request",
+         lambda: TypeAdapter(JobApplicationCreate).validate_json(create_json), max(1, args.number // 20)),
+        ("create: old form handling", lambda: _form_path(CREATE_BODY), args.number),
+        ("update: precompiled validate_json", lambda: application_update_adapter.validate_json(update_json), args.number),
+    ]
+    print(f"{'case':<42}{'us/request':>12}")
+    results = {}
+    for name, fn, number in rows:
+        results[name] = _time_us(fn, number, args.repeat)
+        print(f"{name:<42}{results[name]:>12.2f}")
+
+    batch_us = _time_us(lambda: application_batch_adapter.validate_json(batch_json), batch_number, args.repeat)
+    print(f"{f'batch of {args.batch_size}: precompiled validate_json':<42}{batch_us:>12.2f}"
+          f"   ({batch_us / args.batch_size:.2f} us/item)")
+
+    single_us = results["create: precompiled validate_json"]
+    if args.budget_us is not None and single_us > args.budget_us:
+        print(f"FAIL: create validation {single_us:.2f} us > budget {args.budget_us:.2f} us")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# Production server profile
+#
+#   gunicorn -c gunicorn.conf.py main:app
+#
+# Every value comes from app/settings.py, so the same env vars documented in
+# env.example tune both local and deployed processes.
+from app.server import worker_count
+from app.settings import get_settings
+
+settings = get_settings()
+
+bind = f"{settings.host}:{settings.port}"
+workers = worker_count(settings.web_concurrency)
+worker_class = "app.server.UvicornWorker"
+
+# Each worker builds its own Mongo client in lifespan; never import the app pre-fork
+preload_app = False
+
+# Recycle workers periodically to cap slow leaks; jitter keeps them from restarting together
+max_requests = settings.max_requests
+max_requests_jitter = settings.max_requests_jitter
+
+# On SIGTERM, stop accepting and give in-flight requests this long to finish
+graceful_timeout = settings.graceful_timeout
+# A worker that stops heartbeating for this long is killed and replaced
+timeout = settings.worker_timeout
+keepalive = settings.keepalive
+# Trust X-Forwarded-* only from these proxies; the worker passes this on to uvicorn
+forwarded_allow_ips = settings.forwarded_allow_ips
+
+accesslog = "-"
+errorlog = "-"
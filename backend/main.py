@@ -1,18 +1,26 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from contextlib import asynccontextmanager
 import os
 
-from app.database import connect_to_mongo, close_mongo_connection
-from app.routers import applications, auth, templates
+from app.repositories import init_repositories, close_repositories, check_storage_ready
+from app.http_client import close_http_client
+from app.deadlines import DeadlineMiddleware, DeadlineExceeded, deadline_exceeded_handler, timeout_exception_handler
+from app.scheduler import start_background_jobs, stop_background_jobs
+from app.routers import applications, auth, templates, reminders, analytics
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    await connect_to_mongo()
+    await init_repositories()
+    await start_background_jobs()
     yield
     # Shutdown
-    await close_mongo_connection()
+    await stop_background_jobs()
+    await close_http_client()
+    await close_repositories()
 
 app = FastAPI(
     title="Job Application Tracker API",
@@ -21,6 +29,11 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Every request gets a deadline; CORS is added after so it wraps 504 responses too
+app.add_middleware(DeadlineMiddleware)
+app.add_exception_handler(StarletteHTTPException, timeout_exception_handler)
+app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +47,8 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/api")
 app.include_router(applications.router, prefix="/api")
 app.include_router(templates.router, prefix="/api")
+app.include_router(reminders.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api")
 
 @app.get("/")
 async def root():
@@ -43,6 +58,28 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Report whether this worker can reach the database"""
+    result = await check_storage_ready()
+    if not result["ready"]:
+        return JSONResponse(status_code=503, content={"status": "unavailable", **result})
+    return {"status": "ready", **result}
+
 if __name__ == "__main__":
+    # Single-process development server; production runs `gunicorn -c gunicorn.conf.py main:app`
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from app.settings import get_settings
+
+    settings = get_settings()
+    uvicorn.run(
+        app,
+        host=settings.host,
+        port=settings.port,
+        # uvloop and httptools where they are installed (uvloop is not on Windows);
+        # the gunicorn profile always uses both
+        loop="auto",
+        http="auto",
+        timeout_graceful_shutdown=settings.graceful_timeout,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+    )
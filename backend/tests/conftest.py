@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from app.repositories.sqlite import SQLiteRepositories, SQLiteStore
+from app.settings import get_settings
+
+
+@pytest.fixture
+def run_sqlite(tmp_path):
+    """Run ``scenario(repos)`` against a fresh SQLite database and return its result"""
+    def run(scenario):
+        async def main():
+            store = SQLiteStore(str(tmp_path / "test.db"), readers=2)
+            await store.open()
+            try:
+                return await scenario(SQLiteRepositories(store))
+            finally:
+                await store.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    """Override settings through their environment variables for one test"""
+    def override(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        get_settings.cache_clear()
+        return get_settings()
+
+    yield override
+    monkeypatch.undo()
+    get_settings.cache_clear()
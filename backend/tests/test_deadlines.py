@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app import deadlines
+from app.deadlines import (
+    DeadlineExceeded,
+    DeadlineMiddleware,
+    deadline_exceeded_handler,
+    detached_context,
+    remaining,
+    route_timeout,
+    timeout_exception_handler,
+)
+
+
+@pytest.fixture
+def timeouts(settings_env):
+    """Configure request timeouts; the parsed ROUTE_TIMEOUTS are cached, so clear them too"""
+    def configure(**env):
+        settings_env(**env)
+        deadlines._route_timeouts.cache_clear()
+
+    yield configure
+    deadlines._route_timeouts.cache_clear()
+
+
+@pytest.fixture
+def client(timeouts):
+    """An app wired like main.py, with routes that overrun, fail or succeed"""
+    timeouts(REQUEST_TIMEOUT_SECONDS=5, ROUTE_TIMEOUTS="GET /slow=0.05")
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware)
+    app.add_exception_handler(StarletteHTTPException, timeout_exception_handler)
+    app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(1)
+        return {"done": True}
+
+    @app.get("/fast")
+    async def fast():
+        return {"remaining": remaining()}
+
+    @app.get("/detached")
+    async def detached():
+        return {"request": remaining(), "detached": detached_context().run(remaining)}
+
+    @app.get("/wrapped-timeout")
+    async def wrapped_timeout():
+        # What the routers' catch-all does with a driver or client timeout
+        try:
+            raise asyncio.TimeoutError()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.get("/failure")
+    async def failure():
+        raise HTTPException(status_code=500, detail="boom")
+
+    @app.get("/expired")
+    async def expired():
+        raise DeadlineExceeded()
+
+    return TestClient(app)
+
+
+def test_route_timeout_uses_the_longest_matching_prefix(timeouts):
+    timeouts(REQUEST_TIMEOUT_SECONDS=10, ROUTE_TIMEOUTS="GET /api=5,GET /api/analytics=20,bogus")
+    assert route_timeout("GET", "/api/analytics/funnel") == 20
+    assert route_timeout("GET", "/api/applications") == 5
+    assert route_timeout("POST", "/api/applications") == 10
+
+
+def test_overrunning_request_gets_504(client):
+    response = client.get("/slow")
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request timed out"}
+
+
+def test_handlers_see_the_time_left(client):
+    response = client.get("/fast")
+    assert response.status_code == 200
+    assert 0 < response.json()["remaining"] <= 5
+
+
+def test_detached_work_has_no_request_deadline(client):
+    response = client.get("/detached").json()
+    assert response["request"] is not None
+    assert response["detached"] is None
+
+
+def test_timeouts_behind_a_catch_all_become_504(client):
+    assert client.get("/wrapped-timeout").status_code == 504
+    assert client.get("/expired").status_code == 504
+
+
+def test_other_errors_keep_their_status(client):
+    response = client.get("/failure")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "boom"}
+
+
+def test_remaining_outside_a_request_returns_the_default():
+    assert remaining() is None
+    assert remaining(30) == 30
+
+
+def test_remaining_raises_once_the_deadline_passed():
+    token = deadlines._deadline.set(0.0)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            remaining()
+    finally:
+        deadlines._deadline.reset(token)
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app import ratelimit
+from app.ratelimit import BucketLimit, ConcurrencyLimiter, MemoryRateLimitBackend, check_rate_limit, limit_ip
+
+
+@pytest.fixture
+def buckets(monkeypatch):
+    """A fresh in-memory bucket store, so tests do not share tokens"""
+    backend = MemoryRateLimitBackend()
+    monkeypatch.setattr(ratelimit, "_memory_backend", backend)
+    return backend
+
+
+def test_bucket_allows_the_burst_then_refuses():
+    async def scenario():
+        backend = MemoryRateLimitBackend()
+        limit = BucketLimit(rate=1, burst=3)
+        return [(await backend.take("k", limit))[0] for _ in range(4)]
+
+    assert asyncio.run(scenario()) == [True, True, True, False]
+
+
+def test_bucket_evicts_least_recently_used_keys():
+    async def scenario():
+        backend = MemoryRateLimitBackend(max_keys=2)
+        limit = BucketLimit(rate=1, burst=1)
+        for key in ("a", "b", "c"):
+            await backend.take(key, limit)
+        return list(backend._buckets)
+
+    assert asyncio.run(scenario()) == ["b", "c"]
+
+
+def test_exhausted_bucket_raises_429_with_retry_after(buckets, settings_env):
+    settings_env(RATE_LIMIT_WRITE_PER_MINUTE=6, RATE_LIMIT_WRITE_BURST=2)
+
+    async def scenario():
+        await check_rate_limit("user:u1", "applications.write")
+        await check_rate_limit("user:u1", "applications.write")
+        # Another user has a bucket of their own
+        await check_rate_limit("user:u2", "applications.write")
+        with pytest.raises(HTTPException) as raised:
+            await check_rate_limit("user:u1", "applications.write")
+        return raised.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 429
+    # 6 per minute refills one token every 10 seconds
+    assert error.headers["Retry-After"] == "10"
+
+
+def test_cost_above_the_burst_is_413(buckets, settings_env):
+    settings_env(RATE_LIMIT_BATCH_BURST=5)
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(check_rate_limit("user:u1", "applications.batch", cost=6))
+    assert raised.value.status_code == 413
+
+
+def test_limit_ip_counts_per_client_address(buckets, settings_env):
+    settings_env(RATE_LIMIT_AUTH_IP_BURST=1)
+    app = FastAPI()
+
+    @app.get("/callback", dependencies=[Depends(limit_ip("auth.callback"))])
+    async def callback():
+        return {"ok": True}
+
+    client = TestClient(app)
+    first = client.get("/callback")
+    second = client.get("/callback")
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
+
+
+def test_concurrency_limiter_sheds_when_the_queue_is_full():
+    async def scenario():
+        limiter = ConcurrencyLimiter("uploads", limit=1, queue_timeout=5, max_queue=1)
+        await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as raised:
+            await limiter.acquire()
+        limiter.release()
+        await queued
+        limiter.release()
+        return raised.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "5"
+
+
+def test_concurrency_limiter_sheds_after_the_queue_timeout():
+    async def scenario():
+        limiter = ConcurrencyLimiter("uploads", limit=1, queue_timeout=0.01, max_queue=10)
+        await limiter.acquire()
+        with pytest.raises(HTTPException) as raised:
+            await limiter.acquire()
+        waiting = limiter.waiting
+        limiter.release()
+        # The slot is free again and nobody is left counted as waiting
+        await limiter.acquire()
+        return raised.value, waiting
+
+    error, waiting = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert waiting == 0
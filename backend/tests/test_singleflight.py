@@ -0,0 +1,92 @@
+import asyncio
+
+from app.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+
+    async def scenario():
+        flight = SingleFlight()
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"count": len(calls)}
+
+        key = flight.make_key("u1", "applications.list", skip=0, q=None)
+        return await asyncio.gather(*(flight.do(key, load) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert calls == [1]
+    assert results == [{"count": 1}] * 5
+
+
+def test_make_key_ignores_parameter_order_and_none():
+    assert SingleFlight.make_key("u1", "r", a=1, b=None, c=2) == SingleFlight.make_key("u1", "r", c=2, a=1)
+
+
+def test_invalidate_starts_a_fresh_call_for_later_readers():
+    async def scenario():
+        flight = SingleFlight()
+        key = flight.make_key("u1", "applications.list")
+        version = {"value": "before write"}
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def load():
+            seen = version["value"]
+            started.set()
+            await release.wait()
+            return seen
+
+        first = asyncio.create_task(flight.do(key, load))
+        await started.wait()
+        version["value"] = "after write"
+        flight.invalidate("u1")
+        second = asyncio.create_task(flight.do(key, load))
+        await asyncio.sleep(0)
+        release.set()
+        return await first, await second
+
+    assert asyncio.run(scenario()) == ("before write", "after write")
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    attempts = []
+
+    async def scenario():
+        flight = SingleFlight()
+        key = flight.make_key("u1", "analytics.funnel")
+
+        async def failing():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("database down")
+
+        results = await asyncio.gather(*(flight.do(key, failing) for _ in range(3)), return_exceptions=True)
+
+        async def working():
+            return "ok"
+
+        return results, await flight.do(key, working)
+
+    results, retried = asyncio.run(scenario())
+    assert attempts == [1]
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == "ok"
+
+
+def test_do_json_shares_the_rendered_body():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def load():
+            return {"status": "Pending"}
+
+        return await flight.do_json(flight.make_key("u1", "applications.get", id="a"), load)
+
+    response = asyncio.run(scenario())
+    assert response.media_type == "application/json"
+    assert response.body == b'{"status":"Pending"}'
+
@@ -0,0 +1,145 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from app import purge
+
+USER_ID = str(ObjectId())
+
+
+def _application(company_name, day, **fields):
+    return {
+        "user_id": ObjectId(USER_ID),
+        "company_name": company_name,
+        "link": None,
+        "link_type": None,
+        "date_of_applying": datetime(2026, 1, day),
+        "status": "Pending",
+        "photo_public_id": None,
+        "photo_url": None,
+        "notes": None,
+        **fields,
+    }
+
+
+def test_create_and_list_newest_first(run_sqlite):
+    async def scenario(repos):
+        created = await repos.applications.create(_application("Acme", 1))
+        await repos.applications.create_many([_application("Globex", 3), _application("Initech", 2)])
+        other_user = _application("Hooli", 4, user_id=ObjectId())
+        await repos.applications.create(other_user)
+        listed = await repos.applications.list(USER_ID)
+        page = await repos.applications.list(USER_ID, skip=1, limit=1)
+        fetched = await repos.applications.get(USER_ID, str(created["_id"]))
+        return listed, page, fetched, created
+
+    listed, page, fetched, created = run_sqlite(scenario)
+    assert [doc["company_name"] for doc in listed] == ["Globex", "Initech", "Acme"]
+    assert [doc["company_name"] for doc in page] == ["Initech"]
+    assert fetched["_id"] == created["_id"]
+    assert isinstance(fetched["user_id"], ObjectId)
+    assert fetched["date_of_applying"] == datetime(2026, 1, 1)
+
+
+def test_text_search(run_sqlite):
+    async def scenario(repos):
+        await repos.applications.create(_application("Acme", 1, notes="great rocket people"))
+        await repos.applications.create(_application("Globex", 2, notes="hank scorpio"))
+        return (
+            await repos.applications.list(USER_ID, q="rocket"),
+            await repos.applications.list(USER_ID, q="globex"),
+            await repos.applications.list(USER_ID, q="nothing"),
+        )
+
+    rocket, globex, nothing = run_sqlite(scenario)
+    assert [doc["company_name"] for doc in rocket] == ["Acme"]
+    assert [doc["company_name"] for doc in globex] == ["Globex"]
+    assert nothing == []
+
+
+def test_update_records_status_change(run_sqlite):
+    async def scenario(repos):
+        created = await repos.applications.create(_application("Acme", 1))
+        application_id = str(created["_id"])
+        updated = await repos.applications.update(USER_ID, application_id, {"status": "Rejected", "notes": "no"})
+        unchanged = await repos.applications.update(USER_ID, application_id, {"notes": "still no"})
+        missing = await repos.applications.update(USER_ID, str(ObjectId()), {"notes": "x"})
+        events = await repos.analytics.events(USER_ID)
+        summaries = await repos.analytics.summaries(USER_ID)
+        return updated, unchanged, missing, events, summaries
+
+    updated, unchanged, missing, events, summaries = run_sqlite(scenario)
+    assert updated["status"] == "Rejected"
+    assert updated["statuses_reached"] == ["Pending", "Rejected"]
+    assert unchanged["notes"] == "still no"
+    assert missing is None
+    assert [(e["from_status"], e["to_status"]) for e in events] == [("Pending", "Rejected"), (None, "Pending")]
+    counts = summaries[0]["counts"]
+    assert counts["created"] == 1
+    assert counts["reached:Rejected"] == 1
+
+
+def test_event_pages_keep_events_that_share_a_timestamp(run_sqlite):
+    async def scenario(repos):
+        # One batch gives every creation event the same ts
+        await repos.applications.create_many([_application(f"Company {i}", 1) for i in range(11)])
+        pages = [await repos.analytics.events(USER_ID, limit=4)]
+        while len(pages[-1]) == 4:
+            last = pages[-1][-1]
+            pages.append(await repos.analytics.events(USER_ID, limit=4, before=last["ts"], before_id=str(last["_id"])))
+        return pages, await repos.analytics.events(USER_ID, limit=50)
+
+    pages, everything = run_sqlite(scenario)
+    paged = [event["_id"] for page in pages for event in page]
+    assert len(everything) == 11
+    assert paged == [event["_id"] for event in everything]
+
+
+def test_soft_delete_and_restore(run_sqlite):
+    async def scenario(repos):
+        created = await repos.applications.create(_application("Acme", 1))
+        application_id = str(created["_id"])
+        deleted = await repos.applications.soft_delete(USER_ID, application_id)
+        deleted_again = await repos.applications.soft_delete(USER_ID, application_id)
+        hidden = await repos.applications.get(USER_ID, application_id)
+        listed = await repos.applications.list(USER_ID)
+        restored = await repos.applications.restore(USER_ID, application_id)
+        visible = await repos.applications.get(USER_ID, application_id)
+        return deleted, deleted_again, hidden, listed, restored, visible
+
+    deleted, deleted_again, hidden, listed, restored, visible = run_sqlite(scenario)
+    assert deleted and not deleted_again
+    assert hidden is None and listed == []
+    assert restored
+    assert visible["company_name"] == "Acme"
+
+
+def test_purge_deletes_expired_rows_and_unreferenced_images(run_sqlite, monkeypatch):
+    deleted_images = []
+    monkeypatch.setattr(
+        purge, "delete_images", lambda ids: deleted_images.extend(ids) or {i: "deleted" for i in ids}
+    )
+    monkeypatch.setenv("PURGE_GRACE_DAYS", "0")
+    from app.settings import get_settings
+    get_settings.cache_clear()
+
+    async def scenario(repos):
+        gone = await repos.applications.create(_application("Acme", 1, photo_public_id="job_tracker/a"))
+        kept = await repos.applications.create(_application("Globex", 2, photo_public_id="job_tracker/b"))
+        await repos.applications.create(_application("Initech", 3, photo_public_id="job_tracker/a"))
+        await repos.applications.soft_delete(USER_ID, str(gone["_id"]))
+        await repos.applications.queue_image_deletions(["job_tracker/orphan"])
+        await purge.purge_local(repos)
+        return (
+            await repos.applications.restore(USER_ID, str(gone["_id"])),
+            await repos.applications.get(USER_ID, str(kept["_id"])),
+        )
+
+    try:
+        restored, kept = run_sqlite(scenario)
+    finally:
+        get_settings.cache_clear()
+    assert not restored
+    assert kept is not None
+    # job_tracker/a is still used by Initech, so only the orphan goes
+    assert deleted_images == ["job_tracker/orphan"]
@@ -0,0 +1,32 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.startup import BACKEND_DIR, measure_imports
+
+# Looser than the benchmark's default so shared CI runners do not flake;
+# benchmarks/startup.py is the place to tighten it
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+# Only needed once a request uses them, so importing the app must not load them
+LAZY_MODULES = ("cloudinary", "passlib", "httpx")
+
+
+def test_import_main_does_not_load_lazy_dependencies():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, main; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))",
+        ],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_import_main_within_budget():
+    import_ms = statistics.median(measure_imports()[0] for _ in range(3))
+    assert import_ms < IMPORT_BUDGET_MS, f"import main took {import_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app import cloudinary_config
+from app.uploads import ImageUpload, read_photo_upload, sniff_image_type, store_photo
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+USER_ID = str(ObjectId())
+
+
+@pytest.fixture
+def client():
+    """An app whose one route reads a photo the way the photo endpoint does"""
+    app = FastAPI()
+
+    @app.put("/photo")
+    async def upload(request: Request):
+        photo = await read_photo_upload(request)
+        if photo is None:
+            return None
+        try:
+            return {"content_type": photo.content_type, "size": photo.size, "sha256": photo.sha256}
+        finally:
+            photo.close()
+
+    return TestClient(app)
+
+
+def test_sniff_image_type():
+    assert sniff_image_type(PNG[:12]) == "image/png"
+    assert sniff_image_type(b"\xff\xd8\xff\xe0" + b"\x00" * 8) == "image/jpeg"
+    assert sniff_image_type(b"RIFF\x00\x00\x00\x00WEBP") == "image/webp"
+    assert sniff_image_type(b"%PDF-1.7\n\x00\x00\x00") is None
+
+
+def test_reads_the_photo_and_hashes_it(client):
+    response = client.put("/photo", files={"photo": ("a.png", PNG, "image/png")}, data={"ignored": "x"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "content_type": "image/png",
+        "size": len(PNG),
+        "sha256": hashlib.sha256(PNG).hexdigest(),
+    }
+
+
+def test_no_photo_part_returns_none(client):
+    response = client.put("/photo", files={"other": ("a.png", PNG, "image/png")})
+    assert response.status_code == 200
+    assert response.json() is None
+
+
+def test_rejects_a_body_that_is_not_multipart(client):
+    response = client.put("/photo", data={"photo": "x"})
+    assert response.status_code == 415
+
+
+def test_rejects_a_file_that_is_not_an_image(client):
+    # The declared content type is ignored; only the bytes count
+    response = client.put("/photo", files={"photo": ("a.png", b"plain text, not a png", "image/png")})
+    assert response.status_code == 415
+
+
+def test_rejects_an_oversized_content_length_before_reading(client, settings_env):
+    settings_env(UPLOAD_MAX_BYTES=1024)
+    pulled = []
+
+    def body():
+        pulled.append(1)
+        yield b"x" * 1024
+
+    response = client.put(
+        "/photo",
+        content=body(),
+        headers={"Content-Type": "multipart/form-data; boundary=b", "Content-Length": str(1024 * 1024)},
+    )
+    assert response.status_code == 413
+    assert pulled == []
+
+
+def test_rejects_a_stream_once_it_passes_the_limit():
+    async def scenario():
+        image = ImageUpload("a.png", spool_bytes=16)
+        try:
+            await image.write(PNG, max_bytes=len(PNG))
+            with pytest.raises(HTTPException) as raised:
+                await image.write(b"\x00", max_bytes=len(PNG))
+            return raised.value
+        finally:
+            image.close()
+
+    assert asyncio.run(scenario()).status_code == 413
+
+
+def test_rejects_a_non_image_as_soon_as_its_first_bytes_arrive():
+    async def scenario():
+        image = ImageUpload("a.pdf", spool_bytes=16)
+        try:
+            with pytest.raises(HTTPException) as raised:
+                await image.write(b"%PDF-1.7\n" + b"\x00" * 100, max_bytes=1024)
+            return raised.value
+        finally:
+            image.close()
+
+    assert asyncio.run(scenario()).status_code == 415
+
+
+def test_store_photo_reuses_an_identical_photo(run_sqlite, monkeypatch):
+    uploads = []
+    monkeypatch.setattr(
+        cloudinary_config,
+        "upload_image",
+        lambda file: uploads.append(file.read()) or {"public_id": "job_tracker/new", "secure_url": "https://img/new"},
+    )
+
+    async def photo(content):
+        image = ImageUpload("a.png", spool_bytes=1024)
+        await image.write(content, max_bytes=1024)
+        image.finish()
+        return image
+
+    async def scenario(repos):
+        await repos.applications.create({
+            "user_id": ObjectId(USER_ID),
+            "company_name": "Acme",
+            "date_of_applying": datetime(2026, 1, 1),
+            "status": "Pending",
+            "photo_public_id": "job_tracker/existing",
+            "photo_url": "https://img/existing",
+            "photo_sha256": hashlib.sha256(PNG).hexdigest(),
+        })
+        same = await store_photo(repos, USER_ID, await photo(PNG))
+        different = await store_photo(repos, USER_ID, await photo(PNG + b"\x01"))
+        return same, different
+
+    same, different = run_sqlite(scenario)
+    assert same["photo_public_id"] == "job_tracker/existing"
+    assert different["photo_public_id"] == "job_tracker/new"
+    assert uploads == [PNG + b"\x01"]
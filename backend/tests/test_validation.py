@@ -0,0 +1,58 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.models import JobApplicationCreate, application_batch_adapter, application_create_adapter
+from app.routers.applications import _validate_body
+
+
+def _client():
+    """The precompiled path next to FastAPI's own body parameter, for comparison"""
+    app = FastAPI()
+
+    @app.post("/precompiled")
+    async def precompiled(request: Request):
+        return (await _validate_body(request, application_create_adapter)).model_dump(mode="json")
+
+    @app.post("/batch")
+    async def batch(request: Request):
+        return len(await _validate_body(request, application_batch_adapter))
+
+    @app.post("/native")
+    async def native(payload: JobApplicationCreate):
+        return payload.model_dump(mode="json")
+
+    return TestClient(app)
+
+
+def test_valid_body_is_parsed():
+    client = _client()
+    body = {"company_name": "Acme", "date_of_applying": "2026-01-15T10:30:00Z", "status": "Rejected"}
+    response = client.post("/precompiled", json=body)
+    assert response.status_code == 200
+    assert response.json() == client.post("/native", json=body).json()
+
+
+def test_errors_have_the_same_shape_as_fastapi_body_errors():
+    client = _client()
+    body = {"date_of_applying": "not a date", "status": "Maybe"}
+    precompiled = client.post("/precompiled", json=body)
+    native = client.post("/native", json=body)
+    assert precompiled.status_code == native.status_code == 422
+    assert [error["loc"] for error in precompiled.json()["detail"]] == [
+        error["loc"] for error in native.json()["detail"]
+    ]
+    assert ["body", "company_name"] in [error["loc"] for error in precompiled.json()["detail"]]
+
+
+def test_batch_errors_point_at_the_item():
+    client = _client()
+    body = [{"company_name": "Acme", "date_of_applying": "2026-01-15"}, {"date_of_applying": "2026-01-15"}]
+    response = client.post("/batch", json=body)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1, "company_name"]
+
+
+def test_malformed_json_is_422():
+    response = _client().post("/precompiled", content=b"{not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][0] == "body"
@@ -1,5 +1,5 @@
 import { useState, useEffect } from "react";
-import { useNavigate, useParams } from "react-router-dom";
+import { useNavigate, useParams, useLocation } from "react-router-dom";
 import { useForm, Controller } from "react-hook-form";
 import {
   ArrowLeft,
@@ -21,6 +21,7 @@ import { format } from "date-fns";
 
 const AddEditApplication = () => {
   const navigate = useNavigate();
+  const location = useLocation();
   const { id } = useParams();
   const isEdit = Boolean(id);
 
@@ -58,6 +59,13 @@ const AddEditApplication = () => {
     }
   }, [id]);
 
+  // Set when a new application was saved but its photo upload failed
+  useEffect(() => {
+    if (location.state?.error) {
+      setError(location.state.error);
+    }
+  }, [location.state]);
+
   useEffect(() => {
     setShowOtherTypeInput(watchedLinkType === "other");
   }, [watchedLinkType]);
@@ -146,28 +154,48 @@ const AddEditApplication = () => {
       setLoading(true);
       setError(null);
 
-      const formData = new FormData();
-      formData.append("company_name", data.company_name);
-      formData.append("link", data.link || "");
-
       // Handle link type - use "other" value if "other" is selected
       const linkType =
         data.link_type === "other" ? data.other_link_type : data.link_type;
-      formData.append("link_type", linkType || "");
-
-      formData.append("date_of_applying", data.date_of_applying);
-      formData.append("status", data.status || "Pending");
-      formData.append("notes", data.notes || "");
 
-      if (photoFile) {
-        formData.append("photo", photoFile);
-      }
+      const application = {
+        company_name: data.company_name,
+        link: data.link || "",
+        link_type: linkType || "",
+        date_of_applying: data.date_of_applying,
+        status: data.status || "Pending",
+        notes: data.notes || "",
+      };
 
+      // The photo is uploaded separately, once the application exists
       if (isEdit) {
-        await applicationsAPI.update(id, formData);
+        await applicationsAPI.update(id, application);
+        if (photoFile) {
+          try {
+            await applicationsAPI.uploadPhoto(id, photoFile);
+          } catch (error) {
+            console.error("Error uploading photo:", error);
+            setError("Changes saved, but the photo upload failed. Try uploading it again.");
+            return;
+          }
+        }
         navigate(-1);
       } else {
-        await applicationsAPI.create(formData);
+        const created = await applicationsAPI.create(application);
+        if (photoFile) {
+          try {
+            await applicationsAPI.uploadPhoto(created._id, photoFile);
+          } catch (error) {
+            // The application exists now; continue on its edit page so a retry
+            // only uploads the photo instead of creating it a second time
+            console.error("Error uploading photo:", error);
+            navigate(`/applications/edit/${created._id}`, {
+              replace: true,
+              state: { error: "Application saved, but the photo upload failed. Try uploading it again." },
+            });
+            return;
+          }
+        }
         navigate("/");
       }
     } catch (error) {
@@ -50,18 +50,22 @@ export const applicationsAPI = {
   },
 
   // Create new application
-  create: async (formData) => {
-    const response = await api.post("/applications/", formData, {
-      headers: {
-        "Content-Type": "multipart/form-data",
-      },
-    });
+  create: async (data) => {
+    const response = await api.post("/applications/", data);
     return response.data;
   },
 
   // Update application
-  update: async (id, formData) => {
-    const response = await api.put(`/applications/${id}`, formData, {
+  update: async (id, data) => {
+    const response = await api.put(`/applications/${id}`, data);
+    return response.data;
+  },
+
+  // Attach or replace an application's photo
+  uploadPhoto: async (id, photoFile) => {
+    const formData = new FormData();
+    formData.append("photo", photoFile);
+    const response = await api.put(`/applications/${id}/photo`, formData, {
       headers: {
         "Content-Type": "multipart/form-data",
       },